@@ -1,9 +1,22 @@
 import streamlit as st
-import google.generativeai as genai
-import langdetect
+import streamlit.components.v1 as components
 import logging
-from difflib import SequenceMatcher
-from typing import Dict, Tuple, Optional, List
+import os
+import time
+from typing import Dict, Iterator, Tuple, Optional, List
+
+from catalog import ALL
+from conversation import ConversationMemory
+from gemini_pool import ChatSessionPool
+from language import detect_language
+from markup import HERO_MARKUP, PREMIUM_CSS, STUDIO_NOTE_MARKUP, card_key, card_markup, faq_answer_markup
+from metrics import JsonLinesExporter, Metrics, serve_prometheus
+from prompt_context import MetricsHook, PromptContextBuilder, estimate_tokens
+from query_cache import content_fingerprint
+from response_cache import ResponseCache
+from scheduler import DeadlineExceeded, RequestScheduler, is_retryable
+from session_store import MemoryBackend, SessionData, SessionStore, SQLiteBackend, resolve_session_id
+from studio_data import StudioData, StudioDataStore, build_studio_data
 
 # ---------------------------
 # Logging Configuration
@@ -14,247 +27,385 @@ logger = logging.getLogger(__name__)
 # ---------------------------
 # Global Session State Checks
 # ---------------------------
+SESSION_COOKIE = "studio_sid"
+SESSION_COOKIE_DAYS = 90  # matches the session store's retention
+
+if "session_id" not in st.session_state:
+    # Carried in a first-party cookie, never the URL: the id unlocks saved looks and the chat
+    # transcript, so it must not travel with a shared or bookmarked link
+    cookie = st.context.cookies.get(SESSION_COOKIE)
+    st.session_state.session_id = resolve_session_id(cookie)
+    st.session_state.session_cookie_pending = st.session_state.session_id != cookie
+
 if "selected_package" not in st.session_state:
     st.session_state.selected_package = None
 
-if "favorites" not in st.session_state or not isinstance(st.session_state.favorites, set):
-    st.session_state.favorites = set()
-
 # Initialize chat history with clean, elegant minimalism
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = [
-        {
-            "user": None,
-            "bot": "Assalamu Alaikum! 🌿 I am **Rafiya**. Welcome to my design studio. Let's find your perfect look! 💬"
-        }
-    ]
+GREETING = "Assalamu Alaikum! 🌿 I am **Rafiya**. Welcome to my design studio. Let's find your perfect look! 💬"
 
 # ---------------------------
 # Data Loading (Secrets Access)
 # ---------------------------
-def load_studio_secrets():
-    """Fetches structural configurations directly from Streamlit secrets without pickling errors."""
-    faq_data = st.secrets.get("faq", {}).get("questions", [])
-    personal_data = st.secrets.get("personal", {}).get("data", {})
-    api_key = st.secrets.get("genai", {}).get("api_key", "")
-    packages = personal_data.get("packages", [])
-    return faq_data, personal_data, api_key, packages
+@st.cache_resource(show_spinner=False)
+def get_studio_store(paths: Tuple[str, ...], _metrics_hook: Optional[MetricsHook] = None) -> StudioDataStore:
+    """Watches the secrets files and keeps an indexed snapshot of their content for the whole process."""
+    return StudioDataStore(paths, metrics_hook=_metrics_hook)
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def get_studio_snapshot(fingerprint: str, _secrets: Dict, _metrics_hook: Optional[MetricsHook] = None) -> StudioData:
+    return build_studio_data(_secrets, _metrics_hook)
+
+def load_studio_data(metrics_hook: Optional[MetricsHook] = None) -> StudioData:
+    """Typed, validated studio content with its FAQ, catalog and prompt indexes prebuilt."""
+    paths = tuple(path for path in st.get_option("secrets.files") if os.path.exists(path))
+    if paths:
+        return get_studio_store(paths, metrics_hook).data
+    # Secrets injected without a file on disk (AppTest, some hosts): snapshot keyed by content instead
+    secrets = {section: st.secrets.get(section, {}) for section in ("faq", "personal", "genai")}
+    return get_studio_snapshot(content_fingerprint(secrets), secrets, metrics_hook)
+
+# ---------------------------
+# Pipeline Metrics
+# ---------------------------
+@st.cache_resource(show_spinner=False)
+def get_metrics(port: int, jsonl_path: str, flush_interval: float, jsonl_max_bytes: int) -> Metrics:
+    """Process-wide metrics registry; its Prometheus endpoint and JSON-lines writer start once per process."""
+    metrics = Metrics()
+    if port:
+        serve_prometheus(metrics, port)
+    if jsonl_path:
+        JsonLinesExporter(metrics, jsonl_path, interval=flush_interval, max_bytes=jsonl_max_bytes)
+    return metrics
+
+def load_metrics() -> Metrics:
+    metrics_cfg = st.secrets.get("metrics", {})
+    # Both exporters are opt-in: set [metrics] port and/or jsonl_path to turn them on
+    return get_metrics(
+        port=int(metrics_cfg.get("port", 0)),
+        jsonl_path=metrics_cfg.get("jsonl_path", ""),
+        flush_interval=float(metrics_cfg.get("flush_interval", 60)),
+        jsonl_max_bytes=int(float(metrics_cfg.get("jsonl_max_mb", 10)) * 1024 * 1024),
+    )
+
+def render_admin_panel(metrics: Metrics):
+    """Hidden diagnostics sidebar, shown only when the URL carries ``?admin=<[metrics] admin_key>``."""
+    admin_key = st.secrets.get("metrics", {}).get("admin_key")
+    if not admin_key or st.query_params.get("admin") != admin_key:
+        return
+    snap = metrics.snapshot()
+    with st.sidebar.expander("📈 Pipeline Metrics", expanded=True):
+        st.caption(f"pid {snap['pid']} • up {snap['uptime_s']:.0f} s • latencies in ms")
+        st.dataframe([{"metric": name, **summary} for name, summary in snap["histograms"].items()], hide_index=True)
+        st.json({"counters": snap["counters"], "gauges": snap["gauges"]}, expanded=False)
+
+# ---------------------------
+# Visitor Session Persistence
+# ---------------------------
+@st.cache_resource(show_spinner=False)
+def get_session_store(backend: str, path: str, flush_interval: float, idle_ttl: float,
+                      chat_limits: Tuple[int, int, int, int]) -> SessionStore:
+    """Process-wide write-behind store; with SQLite every app process on the host shares visitors' state."""
+    keep_turns, token_budget, summary_budget, max_log = chat_limits
+
+    def new_session() -> SessionData:
+        # Bounded per-session memory: recent turns verbatim, older ones folded into a short summary
+        return SessionData(set(), ConversationMemory(keep_turns, token_budget, summary_budget, max_log))
+
+    storage = SQLiteBackend(path) if backend == "sqlite" else MemoryBackend()
+    return SessionStore(storage, new_session, flush_interval=flush_interval, idle_ttl=idle_ttl)
+
+def remember_session_cookie():
+    """Stores a newly issued session id so a reload, a restart or another app process finds the same state."""
+    if not st.session_state.pop("session_cookie_pending", False):
+        return
+    # The id unlocks saved state, so over https the browser must never send it in clear text
+    secure = "; Secure" if (st.context.url or "").startswith("https://") else ""
+    components.html(
+        f"<script>window.parent.document.cookie = '{SESSION_COOKIE}={st.session_state.session_id}; "
+        f"Max-Age={SESSION_COOKIE_DAYS * 86400}; Path=/; SameSite=Strict{secure}';</script>",
+        height=0,
+    )
+
+def load_session_store() -> SessionStore:
+    session_cfg, chat_cfg = st.secrets.get("sessions", {}), st.secrets.get("chat", {})
+    return get_session_store(
+        backend=session_cfg.get("backend", "sqlite"),
+        path=session_cfg.get("path", ".cache/sessions.db"),
+        flush_interval=float(session_cfg.get("flush_interval", 2)),
+        idle_ttl=float(session_cfg.get("idle_minutes", 10)) * 60,
+        chat_limits=(
+            int(chat_cfg.get("keep_turns", 6)),
+            int(chat_cfg.get("token_budget", 1200)),
+            int(chat_cfg.get("summary_budget", 300)),
+            int(chat_cfg.get("max_log", 100)),
+        ),
+    )
+
+def get_session() -> SessionData:
+    """This visitor's saved looks and chat memory, loaded lazily from the session store."""
+    # A new browser session re-reads the backend: another process may have served this visitor since
+    refresh = not st.session_state.get("session_loaded")
+    st.session_state.session_loaded = True
+    return load_session_store().get(st.session_state.session_id, refresh=refresh)
+
+def save_session(session: SessionData):
+    load_session_store().mark_dirty(st.session_state.session_id, session)
 
 # ---------------------------
 # Core Logic Engines
 # ---------------------------
+@st.cache_resource(show_spinner=False)
+def get_response_cache(path: str, similarity: float, max_entries: int, ttl_hours: float) -> ResponseCache:
+    """Process-wide semantic cache of Gemini replies, warm-started from its local file."""
+    return ResponseCache(path=path or None, similarity=similarity, maxsize=max_entries, ttl=ttl_hours * 3600)
+
+def load_response_cache() -> ResponseCache:
+    cache_cfg = st.secrets.get("cache", {})
+    return get_response_cache(
+        path=cache_cfg.get("response_path", ".cache/responses.json"),
+        similarity=float(cache_cfg.get("response_similarity", 0.8)),
+        max_entries=int(cache_cfg.get("response_max_entries", 2000)),
+        ttl_hours=float(cache_cfg.get("response_ttl_hours", 168)),
+    )
+
+def build_gemini_model(api_key: str, system_instruction: Optional[str] = None):
+    # Imported on the first chat message: the client and its gRPC stack dominate cold start for catalog-only visitors
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    model = genai.GenerativeModel(
+        model_name="gemini-2.5-flash-lite",
+        generation_config={
+            "temperature": 0.2,
+            "top_p": 0.85,
+            "max_output_tokens": 256,
+        },
+        system_instruction=system_instruction,
+    )
+    logger.info("Gemini AI configured.")
+    return model
+
+@st.cache_resource(show_spinner=False)
+def get_scheduler(max_in_flight: int, requests_per_minute: float, deadline: float) -> RequestScheduler:
+    """Process-wide gate shared by every session's Gemini calls."""
+    return RequestScheduler(max_in_flight=max_in_flight, requests_per_minute=requests_per_minute, deadline=deadline)
+
+def load_scheduler() -> RequestScheduler:
+    genai_cfg = st.secrets.get("genai", {})
+    return get_scheduler(
+        max_in_flight=int(genai_cfg.get("max_in_flight", 4)),
+        requests_per_minute=float(genai_cfg.get("requests_per_minute", 15)),
+        deadline=float(genai_cfg.get("request_deadline", 30)),
+    )
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_chat_pool(api_key: str, fingerprint: str, _system_instruction: str) -> ChatSessionPool:
+    """One lazily configured Gemini client per process and content version, reused across reruns and sessions."""
+    return ChatSessionPool(lambda: build_gemini_model(api_key, _system_instruction))
+
 class AgenticAI:
-    def __init__(self, api_key: str, context: Dict):
+    def __init__(
+        self,
+        api_key: str,
+        context: Dict,
+        response_cache: Optional[ResponseCache] = None,
+        pool: Optional[ChatSessionPool] = None,
+        session_id: str = "default",
+        prompt_context: Optional[PromptContextBuilder] = None,
+        metrics_hook: Optional[MetricsHook] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        memory: Optional[ConversationMemory] = None,
+    ):
         self.api_key = api_key
         self.context = context
-        self.configure_ai()
-
-    def configure_ai(self):
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(
-            model_name="gemini-2.5-flash-lite",
-            generation_config={
-                "temperature": 0.2,
-                "top_p": 0.85,
-                "max_output_tokens": 256,
-            },
+        self.response_cache = response_cache
+        self.prompt_context = prompt_context or PromptContextBuilder(context["faq"], context["personal"])
+        # Cheap to construct: nothing touches Gemini until the first chat message
+        self.pool = pool if pool is not None else ChatSessionPool(
+            lambda: build_gemini_model(api_key, self.prompt_context.system_instruction)
         )
-        self.chat_session = self.model.start_chat()
-        logger.info("Gemini AI configured.")
+        self.session_id = session_id
+        self.metrics_hook = metrics_hook
+        self.scheduler = scheduler
+        self.memory = memory
+
+    @property
+    def model(self):
+        return self.pool.model
+
+    @property
+    def chat_session(self):
+        # A chat released by the pool while idle comes back seeded from this session's memory
+        return self.pool.get_chat(self.session_id, self._seed_history())
+
+    @chat_session.setter
+    def chat_session(self, chat):
+        self.pool.replace_chat(self.session_id, chat)
+
+    def reset_chat(self):
+        """Drops this session's conversation; the next message starts a fresh chat."""
+        self.pool.reset(self.session_id)
+        if self.memory is not None:
+            self.memory.clear()
+
+    def _seed_history(self) -> Optional[List[Dict]]:
+        return (self.memory.seed_history() or None) if self.memory is not None else None
 
     def generate_response(self, user_input: str) -> str:
-        try:
-            try:
-                input_language = langdetect.detect(user_input)
-            except langdetect.lang_detect_exception.LangDetectException:
-                input_language = "en"
-
-            prompt = (
-                f"FAQ Context: {self.context['faq']}\n"
-                f"Personal Context: {self.context['personal']}\n"
-                f"User Input: {user_input}\n\n"
-                "You are Rafiya, a friendly henna artist 🌿✨. "
-                "Respond naturally, matching the user's tone. "
-                "Reply instantly in whatever language the query uses (Bangla, English, or Banglish).\n\n"
-                "CRITICAL: Keep your response short, precise, and directly to the point. No fluff or lengthy introductions. "
-                "Dynamically provide accurate summaries using this data context:\n"
-                "1️⃣ FAQ details.\n"
-                "2️⃣ Bridal/Non-Bridal Packages: Show quick rates & link to 🌿 [Packages](https://rafiyashennaart.streamlit.app/Packages)\n"
-                "3️⃣ Products: List availability & link to 🌿 [Products](https://sites.google.com/view/rafiyashennaart/products)\n"
-                "4️⃣ Training: Provide details & link to 🌿 [Courses](https://sites.google.com/view/rafiyashennaart/courses-training)\n\n"
-                "Always drop short links to secure direct bookings or questions:\n"
-                "💬 [Messenger](https://m.me/Rafiya.HennaArt) | 📱 [WhatsApp](https://wa.me/8801323278403)\n\n"
-                "If information isn't available in context, provide the closest alternative and guide them to message directly."
-            )
+        return "".join(self.stream_response(user_input)).strip()
 
-            response = self.chat_session.send_message(prompt)
-            if response and hasattr(response, "text") and response.text:
-                return response.text.strip()
-            else:
-                self.chat_session = self.model.start_chat()
-                retry = self.chat_session.send_message(prompt)
-                if retry and hasattr(retry, "text") and retry.text:
-                    return retry.text.strip()
-                return "🤖 Couldn’t process statement. Drop a direct note instead!"
+    def stream_response(self, user_input: str) -> Iterator[str]:
+        """Yields reply text as Gemini produces it; errors and fallbacks arrive as a single chunk."""
+        started = time.perf_counter()
+        first_token_at = None
+        try:
+            # Script/marker heuristics first; seeded langdetect only for ambiguous text
+            input_language = detect_language(user_input)
+            self._report("language_detect", {"ms": (time.perf_counter() - started) * 1000})
+
+            # Paraphrases of questions already answered skip the network round trip. Only an opening
+            # message is context-free: a follow-up's reply depends on (and may quote) its own history.
+            cacheable = self.response_cache is not None and self.memory is not None and not self.memory.total_turns
+            if cacheable:
+                cached = self.response_cache.lookup(user_input, input_language)
+                if cached is not None:
+                    self._report_timing(started, time.perf_counter(), event="cached_response_timing")
+                    yield cached
+                    return
+
+            if self.memory is not None:
+                if self.memory.stale:
+                    # Older turns were folded: restart upstream from the summary plus the verbatim window
+                    self.chat_session = self.model.start_chat(history=self._seed_history())
+                    self.memory.stale = False
+                self._report("conversation", {"context_tokens": self.memory.context_tokens(), "turns": self.memory.total_turns})
+
+            # Studio data rides in the system instruction; each turn carries only retrieved snippets
+            prompt = self.prompt_context.build_turn(user_input, input_language)
+
+            parts: List[str] = []
+            for attempt in range(2):
+                if attempt:
+                    # Empty reply: start a clean chat and try once more
+                    self.chat_session = self.model.start_chat(history=self._seed_history())
+                for text in self._send(prompt, attempt):
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    parts.append(text)
+                    yield text
+                if "".join(parts).strip():
+                    break
+
+            if first_token_at is None:
+                self._report("response_empty", {})
+                yield "🤖 Couldn’t process statement. Drop a direct note instead!"
+                return
+
+            reply = "".join(parts).strip()
+            self._report_timing(started, first_token_at)
+            self._report("response_size", {"chars": len(reply), "tokens": estimate_tokens(reply)})
+            if cacheable:
+                self.response_cache.store(user_input, input_language, reply)
         except Exception as e:
             logger.error(f"Error generating response: {e}")
-            return f"⚠️ Error: {e}"
-
-class FAQHandler:
-    def __init__(self, faq_list: List[Dict]):
-        self.faq_list = faq_list
-        # In-memory execution map cache for faster evaluation lookup
-        self.faq_cache: Dict[str, Tuple[str, str]] = {}
+            if isinstance(e, DeadlineExceeded) or is_retryable(e):
+                self._report("response_busy", {})
+                yield "⏳ Our assistant is a little busy right now. Please try again in a moment, or message us directly!"
+            else:
+                self._report("response_error", {})
+                yield f"⚠️ Error: {e}"
+
+    def _send(self, prompt: str, attempt: int) -> Iterator[str]:
+        chat = self.chat_session
+
+        def call(timeout: float) -> Iterator[str]:
+            stream = chat.send_message(prompt, stream=True, request_options={"timeout": timeout})
+            return (text for text in map(_chunk_text, stream) if text)
+
+        if self.scheduler is None:
+            return call(60.0)
+        # The chat is stateful, so only this session's own duplicate submits may share an upstream call;
+        # another session asking the same text has a different history and needs its own reply
+        return self.scheduler.stream(f"{self.session_id}:{attempt}:{prompt}", call)
+
+    def _report(self, event: str, values: Dict[str, float]):
+        if self.metrics_hook is not None:
+            self.metrics_hook(event, values)
+
+    def _report_timing(self, started: float, first_token_at: float, event: str = "response_timing"):
+        values = {
+            "ttft_ms": (first_token_at - started) * 1000,
+            "total_ms": (time.perf_counter() - started) * 1000,
+        }
+        logger.info(f"Reply timing: first token {values['ttft_ms']:.0f} ms, total {values['total_ms']:.0f} ms.")
+        self._report(event, values)
 
-    def find_similar_question(self, user_input: str, threshold: float = 0.65) -> Tuple[Optional[str], Optional[str]]:
-        cleaned_input = user_input.strip().lower()
-        
-        # Immediate memory check return to bypass execution cycles
-        if cleaned_input in self.faq_cache:
-            return self.faq_cache[cleaned_input]
-            
-        best_q, best_a, highest = None, None, 0
-        for faq in self.faq_list:
-            sim = SequenceMatcher(None, cleaned_input, faq['question'].lower()).ratio()
-            if sim > highest:
-                highest, best_q, best_a = sim, faq['question'], faq['answer']
-                
-        if highest >= threshold:
-            # Commit tracking coordinates into data layout
-            self.faq_cache[cleaned_input] = (best_q, best_a)
-            return best_q, best_a
-            
-        return None, None
+def _chunk_text(chunk) -> str:
+    # Chunks blocked by safety filters raise on .text instead of returning ""
+    try:
+        return chunk.text or ""
+    except (AttributeError, ValueError):
+        return ""
 
 # ---------------------------
 # Production-Safe Premium CSS Injector
 # ---------------------------
 def apply_premium_styles():
     st.set_page_config(page_title="Rafiya's Henna Portal", page_icon="🌿", layout="wide")
-    
-    st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Marcellus&family=Montserrat:wght@400;500;600&display=swap');
-
-        /* Canvas Setup */
-        .stApp, [data-testid="stAppViewContainer"], [data-testid="stSidebar"] {
-            background: radial-gradient(circle at top right, #161A24, #0A0D14) !important;
-            color: #E2E8F0 !important;
-            font-family: 'Montserrat', sans-serif;
-        }
-        
-        h1, h2, h3, h4 {
-            font-family: 'Marcellus', serif !important;
-            color: #F8FAFC !important;
-            font-weight: 400 !important;
-        }
-
-        /* Input Controls */
-        div[data-baseweb="select"] > div {
-            border: 1px solid #2C323F !important;
-            border-radius: 8px !important;
-            background-color: #121620 !important;
-        }
-        div[data-baseweb="select"] span, div[data-baseweb="select"] div {
-            color: #E2E8F0 !important;
-        }
-        [data-testid="stWidgetLabel"] p {
-            color: #94A3B8 !important;
-            font-size: 13px !important;
-            font-weight: 500 !important;
-        }
-
-        /* Buttons */
-        .stButton>button {
-            background: transparent !important;
-            color: #C5A059 !important;
-            border: 1px solid #C5A059 !important;
-            border-radius: 4px !important;
-            padding: 8px 20px !important;
-            font-size: 12px !important;
-            font-weight: 600 !important;
-            text-transform: uppercase;
-            letter-spacing: 0.1em;
-            transition: all 0.3s ease !important;
-        }
-        .stButton>button:hover {
-            transform: translateY(-1px) !important;
-            background: #C5A059 !important;
-            color: #0A0D14 !important;
-            box-shadow: 0 4px 15px rgba(197, 160, 89, 0.2) !important;
-        }
-        
-        .stSlider [role="slider"] { background-color: #C5A059 !important; }
-        [data-testid="stExpander"] {
-            background-color: #121620 !important;
-            border: 1px solid #2C323F !important;
-            border-radius: 8px !important;
-        }
-        
-        /* Interactive Atelier Tabs */
-        button[data-baseweb="tab"] {
-            color: #64748B !important;
-            font-family: 'Marcellus', serif !important;
-            font-size: 16px !important;
-            letter-spacing: 0.05em;
-        }
-        button[aria-selected="true"] {
-            color: #C5A059 !important;
-            border-bottom-color: #C5A059 !important;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(PREMIUM_CSS, unsafe_allow_html=True)
 
 # ---------------------------
 # Visual Component Layout Helpers
 # ---------------------------
-def display_package_grid(package_list: List[Dict], prefix: str):
-    """Displays a responsive portfolio grid with variations separating Bridal vs Non-Bridal styling aesthetics."""
-    for idx, item in enumerate(package_list):
-        if idx % 4 == 0:
+def _grid_page(package_list: List[Dict], prefix: str, page_size: int) -> Tuple[int, int]:
+    """Returns (start, stop) of the visible slice and draws pager controls when there is more than one page."""
+    if page_size <= 0 or len(package_list) <= page_size:
+        return 0, len(package_list)
+
+    pages = (len(package_list) + page_size - 1) // page_size
+    page_key, sig_key = f"{prefix}_page", f"{prefix}_page_sig"
+    # Back to the first page whenever the filtered result set changes
+    signature = (len(package_list), package_list[0]['name'], package_list[-1]['name'])
+    if st.session_state.get(sig_key) != signature:
+        st.session_state[sig_key] = signature
+        st.session_state[page_key] = 0
+    page = min(st.session_state.get(page_key, 0), pages - 1)
+
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("← Previous", key=f"{prefix}_prev", disabled=page == 0, use_container_width=True):
+            st.session_state[page_key] = page - 1
+            st.rerun()
+    with info_col:
+        st.markdown(
+            f"<p style='text-align:center; color:#64748B; font-size:12px; margin-top:8px;'>"
+            f"Page {page + 1} of {pages} • {len(package_list)} looks</p>",
+            unsafe_allow_html=True,
+        )
+    with next_col:
+        if st.button("Next →", key=f"{prefix}_next", disabled=page >= pages - 1, use_container_width=True):
+            st.session_state[page_key] = page + 1
+            st.rerun()
+    return page * page_size, min((page + 1) * page_size, len(package_list))
+
+def display_package_grid(package_list: List[Dict], prefix: str, page_size: int = 12):
+    """Displays a responsive portfolio grid with variations separating Bridal vs Non-Bridal styling aesthetics.
+
+    Only the current page's cards and buttons are created; ``page_size <= 0`` shows everything.
+    """
+    session = get_session()
+    start, stop = _grid_page(package_list, prefix, page_size)
+    for idx in range(start, stop):
+        item = package_list[idx]
+        if (idx - start) % 4 == 0:
             cols = st.columns(4)
             
-        col = cols[idx % 4]
+        col = cols[(idx - start) % 4]
         with col:
-            is_loved = item['name'] in st.session_state.favorites
+            is_loved = item['name'] in session.favorites
             love_icon = "❤️ Saved" if is_loved else "🤍 Save Look"
             
-            is_bridal = "bridal" in item.get('type', '').lower()
-            if is_bridal:
-                card_style = """
-                    border: 1px solid #C5A059; 
-                    background: linear-gradient(135deg, #181C26, #0A0D14);
-                    box-shadow: 0 10px 30px rgba(197, 160, 89, 0.08);
-                """
-                badge_style = "background: rgba(197, 160, 89, 0.15); color: #C5A059; border: 1px solid rgba(197, 160, 89, 0.3);"
-                title_color = "#F1E7D0"
-            else:
-                card_style = """
-                    border: 1px solid #2C323F; 
-                    background: #121620;
-                    box-shadow: 0 10px 25px rgba(0,0,0,0.4);
-                """
-                badge_style = "background: rgba(148, 163, 184, 0.1); color: #94A3B8;"
-                title_color = "#FFFFFF"
-            
-            st.markdown(f"""
-            <div style="border-radius: 12px; padding: 22px; display: flex; flex-direction: column; 
-                 justify-content: space-between; height: 340px; margin-bottom: 12px; {card_style}">
-                <div>
-                    <span style="font-size: 9px; font-weight: 600; padding: 4px 10px; border-radius: 4px; text-transform: uppercase; letter-spacing: 0.05em; {badge_style}">
-                        {item['type']}
-                    </span>
-                    <h3 style="margin-top: 16px; margin-bottom: 4px; font-size: 18px; line-height: 1.3; color: {title_color};">{item['name']}</h3>
-                    <div style="font-size:11px; color: #64748B; margin-bottom: 12px;">📐 {item['length']} • ✋ {item['hand']}</div>
-                    <p style="color: #94A3B8; font-size: 13px; overflow-y: auto; max-height: 95px; line-height: 1.5;">
-                        {item['description']}
-                    </p>
-                </div>
-                <div style="border-top: 1px solid rgba(255,255,255,0.05); padding-top: 12px; font-family: 'Marcellus', serif; font-size: 16px; color: #C5A059;">
-                    {item['price']} BDT
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(card_markup(card_key(item)), unsafe_allow_html=True)
             
             btn_col1, btn_col2 = st.columns([5, 4])
             with btn_col1:
@@ -264,27 +415,70 @@ def display_package_grid(package_list: List[Dict], prefix: str):
             with btn_col2:
                 if st.button(love_icon, key=f"fav_{prefix}_{idx}_{item['name']}", use_container_width=True):
                     if is_loved:
-                        st.session_state.favorites.remove(item['name'])
+                        session.favorites.discard(item['name'])
                         st.toast(f"Removed {item['name']} from lookbook.", icon="🗑️")
                     else:
-                        st.session_state.favorites.add(item['name'])
+                        session.favorites.add(item['name'])
                         st.toast(f"Saved {item['name']} to your lookbook!", icon="❤️")
+                    save_session(session)
                     st.rerun()
 
+def assistant_bubble(text: str) -> str:
+    return f"""<div style="background:#121620; color:#E2E8F0; padding:12px 16px; border-radius:12px; font-size:14.5px; border: 1px solid #C5A059; max-width: 85%;"><b>Henna Whisperer:</b><br>{text}</div>"""
+
+def render_earlier_turns(conversation: ConversationMemory):
+    """Folded turns sit in one collapsed expander, drawn as a single transcript element instead of two bubbles each."""
+    older = conversation.older()
+    if not older:
+        return
+    hidden = conversation.total_turns - conversation.window
+    label = f"🕰️ Earlier conversation ({hidden} messages)"
+    with st.expander(label, expanded=False):
+        if hidden > len(older):
+            st.caption(f"Showing the last {len(older)}; older messages survive only in the summary below.")
+        transcript = "\n\n".join(f"**You:** {turn['user']}\n\n**Henna Whisperer:** {turn['bot']}" for turn in older)
+        st.markdown(transcript)
+        st.caption("Summary the assistant keeps in mind:")
+        st.text(conversation.summary)
+
 # ---------------------------
 # Main Routing Application
 # ---------------------------
 def main():
+    metrics = load_metrics()
+    # Where a rerun spends its time, as rerun_<phase>_ms next to the page_render_ms total
+    phases = metrics.phases("rerun")
     apply_premium_styles()
-
-    # Dynamic loading safely decoupled from data cache pickling limitations
-    faq_data, personal_data, api_key, packages = load_studio_secrets()
-
-    if "faq_handler" not in st.session_state:
-        st.session_state.faq_handler = FAQHandler(faq_data)
-        
-    faq_handler = st.session_state.faq_handler
-    agentic_ai = AgenticAI(api_key=api_key, context={"faq": faq_data, "personal": personal_data})
+    remember_session_cookie()
+    phases.mark("styles")
+
+    # Indexed snapshot shared process-wide; swapped in the background when secrets change
+    studio = load_studio_data(metrics.hook)
+    session = get_session()
+    faq_handler = studio.faq_handler
+    response_cache, scheduler = load_response_cache(), load_scheduler()
+    # Cached replies quote prices: a content change (hot reload or restart) invalidates them all
+    response_cache.ensure_version(studio.fingerprint)
+    pool = get_chat_pool(studio.api_key, studio.fingerprint, studio.prompt_context.system_instruction)
+    agentic_ai = AgenticAI(
+        api_key=studio.api_key,
+        context={"faq": list(studio.faqs), "personal": studio.personal},
+        response_cache=response_cache,
+        pool=pool,
+        session_id=st.session_state.session_id,
+        prompt_context=studio.prompt_context,
+        metrics_hook=metrics.hook,
+        scheduler=scheduler,
+        memory=session.conversation,
+    )
+    # Components keep their own counters; the registry reads them on export
+    metrics.register("scheduler", scheduler.stats)
+    metrics.register("response_cache", response_cache.stats)
+    metrics.register("faq_cache", faq_handler.faq_cache.stats)
+    metrics.register("chat_pool", lambda: {"sessions": len(pool)})
+    metrics.register("session_store", load_session_store().stats)
+    render_admin_panel(metrics)
+    phases.mark("setup")
 
     # --- ROUTE A: DEEP-DIVE ATELIER SCREEN ---
     if st.session_state.selected_package:
@@ -329,17 +523,11 @@ def main():
                 "[✉️ Direct Email Studio](mailto:rafiyashennaart@gmail.com)"
             )
             
+        phases.mark("detail")
+
     # --- ROUTE B: ARTIST PORTAL INTERFACE ---
     else:
-        st.markdown("""
-        <div style="text-align: center; margin-top: 20px; margin-bottom: 35px;">
-            <div style="display: inline-block; width: 70px; height: 70px; border-radius: 50%; background: linear-gradient(135deg, #C5A059, #8D6E31); padding: 1px; margin-bottom: 10px;">
-                <div style="width: 100%; height: 100%; border-radius: 50%; background: #0A0D14; display: flex; align-items: center; justify-content: center; font-size: 28px;">🌿</div>
-            </div>
-            <h1 style="font-size: 2.6rem; margin: 0; letter-spacing: 0.05em; color: #FFFFFF;">RAFIYA HENNA ART</h1>
-            <p style="color: #C5A059; font-weight: 500; font-size: 11px; letter-spacing: 0.35em; text-transform: uppercase; margin-top: 4px; margin-bottom: 0;">Atelier & Design Studio</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(HERO_MARKUP, unsafe_allow_html=True)
 
         tab_chat, tab_packages, tab_faq = st.tabs([
             "💬 Private Studio Lounge", 
@@ -352,103 +540,121 @@ def main():
             st.markdown(f"### 🌿 Automated Assistant")
             st.markdown("<p style='font-size:13px; color:#64748B; margin-top:-10px;'>Inquire instantly about designs, structural compositions, or preservation details.</p>", unsafe_allow_html=True)
             
-            for chat in st.session_state.chat_history:
-                if chat['user']:
-                    with st.chat_message("user"):
-                        st.markdown(f"""<div style="background:#1E293B; color:#F1F5F9; padding:12px 16px; border-radius:12px; font-size:14.5px; border: 1px solid #334155; max-width: 80%; margin-left: auto;">{chat['user']}</div>""", unsafe_allow_html=True)
-                
+            conversation = agentic_ai.memory
+            with st.chat_message("assistant"):
+                st.markdown(assistant_bubble(GREETING), unsafe_allow_html=True)
+            render_earlier_turns(conversation)
+            for chat in conversation.recent():
+                with st.chat_message("user"):
+                    st.markdown(f"""<div style="background:#1E293B; color:#F1F5F9; padding:12px 16px; border-radius:12px; font-size:14.5px; border: 1px solid #334155; max-width: 80%; margin-left: auto;">{chat['user']}</div>""", unsafe_allow_html=True)
                 with st.chat_message("assistant"):
-                    st.markdown(f"""<div style="background:#121620; color:#E2E8F0; padding:12px 16px; border-radius:12px; font-size:14.5px; border: 1px solid #C5A059; max-width: 85%;"><b>Henna Whisperer:</b><br>{chat['bot']}</div>""", unsafe_allow_html=True)
+                    st.markdown(assistant_bubble(chat['bot']), unsafe_allow_html=True)
 
+            # Price, contact and near-miss FAQ questions are answered from studio data without Gemini
+            local_answers = bool(st.secrets.get("chat", {}).get("local_answers", True))
             user_query = st.chat_input("Message assistant for direct pricing, design structures, or tips...")
 
             if user_query:
                 with st.chat_message("user"):
                     st.markdown(f"""<div style="background:#1E293B; padding:12px 16px; border-radius:12px;">{user_query}</div>""", unsafe_allow_html=True)
                 
-                with st.spinner("Weaving insight..."):
-                    faq_q, faq_a = faq_handler.find_similar_question(user_query)
-                    reply = f"🔍 **Studio FAQ:** *{faq_q}*\n\n{faq_a}" if faq_a else agentic_ai.generate_response(user_query)
-                
+                bubble = """<div style="background:#121620; padding:12px 16px; border-radius:12px; border: 1px solid #C5A059;">{}</div>"""
                 with st.chat_message("assistant"):
-                    st.markdown(f"""<div style="background:#121620; padding:12px 16px; border-radius:12px; border: 1px solid #C5A059;">{reply}</div>""", unsafe_allow_html=True)
+                    placeholder = st.empty()
+                    with st.spinner("Weaving insight..."):
+                        with metrics.timer("faq_match_ms"):
+                            faq_q, faq_a = faq_handler.find_similar_question(user_query)
+                        metrics.inc("faq_hit" if faq_a else "faq_miss")
+                        local = None
+                        if not faq_a and local_answers:
+                            with metrics.timer("local_answer_ms"):
+                                local = studio.retriever.answer(user_query)
+                        metrics.inc("tier_faq" if faq_a else f"tier_local_{local.kind}" if local else "tier_llm")
+                        if faq_a:
+                            stream = iter([f"🔍 **Studio FAQ:** *{faq_q}*\n\n{faq_a}"])
+                        elif local:
+                            stream = iter([local.text])
+                        else:
+                            stream = agentic_ai.stream_response(user_query)
+                        # Spinner only covers the wait for the first chunk
+                        reply = next(stream, "")
+
+                    placeholder.markdown(bubble.format(reply + "▌"), unsafe_allow_html=True)
+                    for chunk in stream:
+                        reply += chunk
+                        placeholder.markdown(bubble.format(reply + "▌"), unsafe_allow_html=True)
+                    reply = reply.strip()
+                    placeholder.markdown(bubble.format(reply), unsafe_allow_html=True)
                 
-                st.session_state.chat_history.append({"user": user_query, "bot": reply})
+                conversation.add(user_query, reply)
+                save_session(session)
                 st.rerun()
 
-            st.markdown("""
-            <div style='background: rgba(148,163,184,0.04); border-radius: 8px; padding: 12px 16px; margin-top: 20px; border: 1px dashed rgba(255,255,255,0.08);'>
-                <p style='margin:0; font-size:11.5px; color:#64748B; line-height:1.4;'>
-                    ⚠️ <b>Studio Note:</b> Automated details may contain minor variance and are optimized to provide immediate clarity when the artist is away. Please confirm pricing and active slot scheduling directly via personal text link.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(STUDIO_NOTE_MARKUP, unsafe_allow_html=True)
 
-            if len(st.session_state.chat_history) > 1:
+            if len(conversation):
                 st.markdown("<br>", unsafe_allow_html=True)
                 if st.button("🗑️ Reset Lounge Workspace", use_container_width=True):
-                    del st.session_state.chat_history[1:]
-                    agentic_ai.configure_ai()
+                    agentic_ai.reset_chat()
+                    save_session(session)
                     st.rerun()
 
+        phases.mark("chat")
+
         # --- TAB 2: PACKAGES & CATALOG ---
         with tab_packages:
-            if st.session_state.favorites:
-                st.markdown(f"### ❤️ Saved Portfolio Vault ({len(st.session_state.favorites)})")
-                saved_items = [p for p in packages if p['name'] in st.session_state.favorites]
-                display_package_grid(saved_items, prefix="vault")
+            catalog = studio.catalog
+            page_size = int(st.secrets.get("catalog", {}).get("page_size", 12))
+            if session.favorites:
+                st.markdown(f"### ❤️ Saved Portfolio Vault ({len(session.favorites)})")
+                saved_items = catalog.by_names(session.favorites)
+                display_package_grid(saved_items, prefix="vault", page_size=page_size)
                 st.markdown("<hr style='border-color: rgba(255,255,255,0.05);'>", unsafe_allow_html=True)
 
             st.markdown("### 📦 Portfolio Matrix Lookbook")
             col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 2])
+            # Each selection narrows a bitmap; later dropdowns only offer values still present
             with col1:
-                types = sorted(list(set(p['type'] for p in packages)))
-                sel_type = st.selectbox("Aesthetic Category", ["All"] + types)
-            filtered = [p for p in packages if sel_type == "All" or p['type'] == sel_type]
+                sel_type = st.selectbox("Aesthetic Category", [ALL] + catalog.options("type"))
+            filtered = catalog.narrow(catalog.all_bits, "type", sel_type)
             
             with col2:
-                lengths = sorted(list(set(p['length'] for p in filtered)))
-                sel_length = st.selectbox("Design Architecture", ["All"] + lengths)
-            filtered = [p for p in filtered if sel_length == "All" or p['length'] == sel_length]
+                sel_length = st.selectbox("Design Architecture", [ALL] + catalog.options("length", filtered))
+            filtered = catalog.narrow(filtered, "length", sel_length)
             
             with col3:
-                hands = sorted(list(set(p['hand'] for p in filtered)))
-                sel_hand = st.selectbox("Coverage Scale", ["All"] + hands)
-            filtered = [p for p in filtered if sel_hand == "All" or p['hand'] == sel_hand]
+                sel_hand = st.selectbox("Coverage Scale", [ALL] + catalog.options("hand", filtered))
+            filtered = catalog.narrow(filtered, "hand", sel_hand)
             
             with col4:
-                sides = sorted(list(set(p['side'] for p in filtered)))
-                sel_surface = st.selectbox("Surface Alignment", ["All"] + sides)
-            filtered = [p for p in filtered if sel_surface == "All" or p['side'] == sel_surface]
+                sel_surface = st.selectbox("Surface Alignment", [ALL] + catalog.options("side", filtered))
+            filtered = catalog.narrow(filtered, "side", sel_surface)
             
             with col5:
-                prices = [p['price'] for p in filtered]
-                min_p, max_p = (min(prices), max(prices)) if prices else (0, 0)
+                min_p, max_p = catalog.price_range(filtered)
                 if min_p == max_p:
                     st.number_input("Budget Threshold (BDT)", value=max_p, disabled=True)
                     sel_price = max_p
                 else:
                     sel_price = st.slider("Budget Threshold (BDT)", int(min_p), int(max_p), int(max_p))
 
-            final_packages = [p for p in filtered if p['price'] <= sel_price]
-            display_package_grid(final_packages, prefix="catalog")
+            final_packages = catalog.materialize(catalog.at_most(filtered, sel_price))
+            display_package_grid(final_packages, prefix="catalog", page_size=page_size)
+
+        phases.mark("catalog")
 
         # --- TAB 3: FAQ KNOWLEDGE BASE ---
         with tab_faq:
             st.markdown("### 💡 Studio Learning & Care Knowledge Base")
-            if faq_data:
-                categories = sorted(list(set(faq['category'] for faq in faq_data)))
-                for cat in categories:
+            if studio.faqs:
+                for cat, cat_faqs in studio.faq_by_category:
                     st.markdown(f"#### 📁 {cat.upper()}")
-                    cat_faqs = [f for f in faq_data if f['category'] == cat]
                     for faq in cat_faqs:
                         with st.expander(f"✨ {faq['question']}", expanded=False):
-                            st.markdown(f"""
-                            <div style="background-color: #0A0D14; padding: 18px; border-left: 2px solid #C5A059; 
-                                        border-radius: 4px; color: #94A3B8; font-size: 14px; line-height: 1.7;">
-                                {faq['answer']}
-                            </div>
-                            """, unsafe_allow_html=True)
+                            st.markdown(faq_answer_markup(faq['answer']), unsafe_allow_html=True)
+        phases.mark("faq")
 
 if __name__ == "__main__":
-    main()
+    # Includes reruns cut short by st.rerun(), which exit main() through an exception
+    with load_metrics().timer("page_render_ms"):
+        main()
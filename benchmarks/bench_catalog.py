@@ -0,0 +1,81 @@
+"""Cascading catalog filtering: precomputed facet bitmaps vs the original list comprehensions.
+
+Run from the repository root:  python benchmarks/bench_catalog.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from catalog import ALL, CatalogIndex  # noqa: E402
+from synthetic import make_packages  # noqa: E402
+
+SCALES = (1_000, 10_000, 100_000)
+ROUNDS = 50
+
+
+def list_filter(packages, sel):
+    """Reference copy of the pre-index Curated Collections filtering."""
+    types = sorted(list(set(p['type'] for p in packages)))
+    filtered = [p for p in packages if sel[0] == "All" or p['type'] == sel[0]]
+    lengths = sorted(list(set(p['length'] for p in filtered)))
+    filtered = [p for p in filtered if sel[1] == "All" or p['length'] == sel[1]]
+    hands = sorted(list(set(p['hand'] for p in filtered)))
+    filtered = [p for p in filtered if sel[2] == "All" or p['hand'] == sel[2]]
+    sides = sorted(list(set(p['side'] for p in filtered)))
+    filtered = [p for p in filtered if sel[3] == "All" or p['side'] == sel[3]]
+    prices = [p['price'] for p in filtered]
+    bounds = (min(prices), max(prices)) if prices else (0, 0)
+    final = [p for p in filtered if p['price'] <= sel[4]]
+    return types, lengths, hands, sides, bounds, final
+
+
+def index_filter(catalog, sel):
+    types = catalog.options("type")
+    bits = catalog.narrow(catalog.all_bits, "type", sel[0])
+    lengths = catalog.options("length", bits)
+    bits = catalog.narrow(bits, "length", sel[1])
+    hands = catalog.options("hand", bits)
+    bits = catalog.narrow(bits, "hand", sel[2])
+    sides = catalog.options("side", bits)
+    bits = catalog.narrow(bits, "side", sel[3])
+    bounds = catalog.price_range(bits)
+    return types, lengths, hands, sides, bounds, catalog.at_most(bits, sel[4])
+
+
+def main():
+    rng = random.Random(3)
+    print(f"{'packages':>9} {'build ms':>9} {'list ms':>9} {'index ms':>9} {'+materialize ms':>16}")
+    for n in SCALES:
+        packages = make_packages(n)
+        start = time.perf_counter()
+        catalog = CatalogIndex(packages)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        selections = []
+        for _ in range(ROUNDS):
+            pick = lambda facet: rng.choice([ALL] + catalog.options(facet))  # noqa: E731
+            selections.append((pick("type"), pick("length"), pick("hand"), ALL, rng.randrange(500, 20_000)))
+
+        start = time.perf_counter()
+        expected = [list_filter(packages, sel) for sel in selections]
+        list_ms = (time.perf_counter() - start) * 1000 / ROUNDS
+
+        start = time.perf_counter()
+        got = [index_filter(catalog, sel) for sel in selections]
+        index_ms = (time.perf_counter() - start) * 1000 / ROUNDS
+
+        start = time.perf_counter()
+        final = [catalog.materialize(g[-1]) for g in got]
+        materialize_ms = (time.perf_counter() - start) * 1000 / ROUNDS
+
+        for exp, g, f in zip(expected, got, final):
+            assert exp[:5] == g[:5] and exp[5] == f, "bitmap filtering disagrees with list filtering"
+        print(f"{n:>9} {build_ms:>9.1f} {list_ms:>9.3f} {index_ms:>9.3f} {index_ms + materialize_ms:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Per-turn upstream context, latency and session memory vs conversation length, with and without
+the bounded ConversationMemory.
+
+"unbounded" reproduces the old behaviour: one Gemini chat whose history grows every turn and a
+session chat log that keeps every message. The stub model charges `prefill_delay` per 1000
+characters resent, so latency tracks context size the way a real API does.
+
+Run from the repository root:  python benchmarks/bench_conversation.py [--turns 100]
+"""
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from conversation import ConversationMemory  # noqa: E402
+from gemini_pool import ChatSessionPool  # noqa: E402
+from Home import AgenticAI  # noqa: E402
+from stub_llm import StubModel  # noqa: E402
+from synthetic import TOPICS, make_faqs, make_packages  # noqa: E402
+
+CHECKPOINTS = (1, 10, 25, 50, 100, 200, 400)
+
+
+def run(turns: int, bounded: bool, prefill_delay: float):
+    context = {"faq": make_faqs(40), "personal": {"name": "Rafiya", "packages": make_packages(20)}}
+    model = StubModel(words=60, first_token_delay=0.01, chunk_delay=0.0, prefill_delay=prefill_delay)
+    memory = ConversationMemory() if bounded else None
+    log = []
+    ai = AgenticAI("offline", context, pool=ChatSessionPool(lambda: model), memory=memory)
+
+    rows = []
+    for turn in range(1, turns + 1):
+        query = f"tell me more about {TOPICS[turn % len(TOPICS)]} for my event number {turn}"
+        start = time.perf_counter()
+        reply = ai.generate_response(query)
+        elapsed = (time.perf_counter() - start) * 1000
+        if memory is not None:
+            memory.add(query, reply)
+        else:
+            log.append({"user": query, "bot": reply})
+        if turn in CHECKPOINTS or turn == turns:
+            state = memory if memory is not None else log
+            rendered = 2 * (memory.window if memory is not None else len(log)) + (1 if memory is not None and memory.older() else 0)
+            rows.append((turn, model.sent_chars[-1] // 4, elapsed, len(pickle.dumps(state)), rendered))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--prefill-delay", type=float, default=0.005, help="stub seconds per 1000 characters sent")
+    args = parser.parse_args()
+
+    print(f"{'mode':>9} {'turn':>5} {'sent tokens':>12} {'reply ms':>9} {'state bytes':>12} {'chat elements':>14}")
+    for bounded in (False, True):
+        for turn, tokens, ms, size, rendered in run(args.turns, bounded, args.prefill_delay):
+            print(f"{'bounded' if bounded else 'unbounded':>9} {turn:>5} {tokens:>12} {ms:>9.1f} {size:>12} {rendered:>14}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compares the indexed and batch FAQ matchers against the original linear SequenceMatcher scan.
+
+Both shortlist candidates, so they are approximate: "agree" is the share of queries where they
+return the same match as the full scan.
+
+Run from the repository root:  python benchmarks/bench_faq_matching.py
+"""
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from faq_batch import FAQBatchMatcher  # noqa: E402
+from faq_index import FAQIndex  # noqa: E402
+from query_cache import normalize_query  # noqa: E402
+from synthetic import make_faqs, make_queries  # noqa: E402
+
+THRESHOLD = 0.65
+SCALES = (100, 1_000, 10_000)
+QUERIES = 200
+
+
+def linear_scan(faq_list: List[Dict], questions: List[str], cleaned_input: str, threshold: float) -> Tuple[Optional[str], Optional[str]]:
+    """Reference exhaustive scan: the pre-index FAQHandler loop over the same normalized questions."""
+    best_q, best_a, highest = None, None, 0
+    for faq, question in zip(faq_list, questions):
+        sim = SequenceMatcher(None, cleaned_input, question).ratio()
+        if sim > highest:
+            highest, best_q, best_a = sim, faq['question'], faq['answer']
+    if highest >= threshold:
+        return best_q, best_a
+    return None, None
+
+
+def main():
+    print(f"{'faqs':>7} {'build ms':>9} {'linear ms/q':>12} {'index ms/q':>11} {'speedup':>8} {'agree':>7} {'batch ms/q':>11} {'agree':>7}")
+    for n in SCALES:
+        faqs = make_faqs(n)
+        queries = [normalize_query(q) for q in make_queries(faqs, QUERIES)]
+
+        start = time.perf_counter()
+        index = FAQIndex(faqs)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # The linear scan is quadratic in practice; sample fewer queries at the largest scale
+        linear_queries = queries if n < 10_000 else queries[:40]
+        start = time.perf_counter()
+        expected = [linear_scan(faqs, index.questions, q, THRESHOLD) for q in linear_queries]
+        linear_ms = (time.perf_counter() - start) * 1000 / len(linear_queries)
+
+        start = time.perf_counter()
+        got = [index.best_match(q, THRESHOLD)[:2] for q in queries]
+        index_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        batch = FAQBatchMatcher(faqs)
+        start = time.perf_counter()
+        batched = [(m.question, m.answer) for m in batch.match_batch(queries, THRESHOLD)]
+        batch_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        agree = sum(e == g for e, g in zip(expected, got)) / len(expected)
+        batch_agree = sum(e == g for e, g in zip(expected, batched)) / len(expected)
+        print(f"{n:>7} {build_ms:>9.1f} {linear_ms:>12.3f} {index_ms:>11.3f} {linear_ms / index_ms:>7.1f}x {agree:>7.1%}"
+              f" {batch_ms:>11.3f} {batch_agree:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
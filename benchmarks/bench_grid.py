@@ -0,0 +1,50 @@
+"""Rerun time of the Curated Collections tab with and without grid pagination.
+
+Run from the repository root:  python benchmarks/bench_grid.py
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from synthetic import make_secrets  # noqa: E402
+
+SCALES = (100, 1_000, 10_000)
+RERUNS = 5
+
+
+def time_reruns(packages: int, page_size: int) -> tuple:
+    at = AppTest.from_file(str(ROOT / "Home.py"), default_timeout=600)
+    for section, values in make_secrets(50, packages).items():
+        at.secrets[section] = values
+    at.secrets["catalog"] = {"page_size": page_size}
+    at.run()
+    if at.exception:
+        raise SystemExit(f"Script failed: {at.exception[0].message}")
+    timings = []
+    for _ in range(RERUNS):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(at.button)
+
+
+def main():
+    print(f"{'packages':>9} {'mode':>12} {'rerun ms':>10} {'buttons':>8}")
+    for n in SCALES:
+        for page_size, mode in ((0, "all cards"), (12, "page of 12")):
+            if page_size == 0 and n > 1_000:
+                # Tens of thousands of widgets per rerun; takes minutes and proves the same point
+                print(f"{n:>9} {mode:>12} {'skipped':>10}")
+                continue
+            rerun_ms, buttons = time_reruns(n, page_size)
+            print(f"{n:>9} {mode:>12} {rerun_ms:>10.1f} {buttons:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Accuracy and latency of the language router against raw langdetect.
+
+Run from the repository root:  python benchmarks/bench_language.py
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import langdetect  # noqa: E402
+
+from language import _route, detect_language  # noqa: E402
+
+LABELED = [
+    ("How much is the bridal package?", "en"),
+    ("Do you offer home service in Uttara?", "en"),
+    ("How long does the stain last?", "en"),
+    ("Is your henna organic and chemical free?", "en"),
+    ("Can I book for next Friday evening?", "en"),
+    ("What designs suit a small wrist?", "en"),
+    ("price list please", "en"),
+    ("Thanks a lot!", "en"),
+    ("bridal mehndi", "en"),
+    ("Which package is best for engagement?", "en"),
+    ("ব্রাইডাল প্যাকেজের দাম কত?", "bn"),
+    ("আপনারা কি হোম সার্ভিস দেন?", "bn"),
+    ("মেহেদির রং কতদিন থাকে?", "bn"),
+    ("শুক্রবার বুকিং দেওয়া যাবে?", "bn"),
+    ("অর্গানিক মেহেদি আছে?", "bn"),
+    ("কোর্স ফি কত টাকা?", "bn"),
+    ("bridal package er dam koto?", "banglish"),
+    ("apni ki home service den?", "banglish"),
+    ("mehedi koto din thake?", "banglish"),
+    ("ami friday te booking dite chai", "banglish"),
+    ("kto tk lagbe dui haate?", "banglish"),
+    ("apu apnar course kobe shuru hobe?", "banglish"),
+    ("organic cone ache?", "banglish"),
+    ("kivabe order korbo?", "banglish"),
+    ("dhaka er baire jaben?", "banglish"),
+    ("vai price ta bolen", "banglish"),
+    ("ব্রাইডাল price কত?", "bn"),
+    ("amar wedding 20 tarikh, slot ache?", "banglish"),
+]
+
+
+def langdetect_label(text: str) -> str:
+    try:
+        code = langdetect.detect(text)
+    except langdetect.lang_detect_exception.LangDetectException:
+        return "en"
+    return code if code in ("bn", "en") else "other"
+
+
+def main():
+    router_hits = sum(detect_language(q) == label for q, label in LABELED)
+    raw_hits = sum(langdetect_label(q) == label for q, label in LABELED)
+    print(f"router accuracy     {router_hits}/{len(LABELED)}")
+    print(f"langdetect accuracy {raw_hits}/{len(LABELED)} (no Banglish profile)")
+    for q, label in LABELED:
+        got = detect_language(q)
+        if got != label:
+            print(f"  miss: {q!r} -> {got} (expected {label})")
+
+    rounds = 50
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q, _ in LABELED:
+            langdetect.detect(q)
+    raw_us = (time.perf_counter() - start) * 1e6 / (rounds * len(LABELED))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        _route.cache_clear()
+        for q, _ in LABELED:
+            detect_language(q)
+    cold_us = (time.perf_counter() - start) * 1e6 / (rounds * len(LABELED))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q, _ in LABELED:
+            detect_language(q)
+    warm_us = (time.perf_counter() - start) * 1e6 / (rounds * len(LABELED))
+
+    print(f"langdetect.detect   {raw_us:8.1f} us/query")
+    print(f"router (uncached)   {cold_us:8.1f} us/query")
+    print(f"router (memoized)   {warm_us:8.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
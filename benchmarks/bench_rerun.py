@@ -0,0 +1,74 @@
+"""Times cold start and non-chat reruns (filter changes, Save Look clicks) of the Streamlit app headlessly.
+
+Gemini client construction is real but never reaches the network, so the numbers include
+genai.configure / GenerativeModel / start_chat cost wherever the script still pays it.
+
+Run from the repository root:  python benchmarks/bench_rerun.py
+Compare with an older revision:  git show <rev>:Home.py > /tmp/Home_old.py
+                                 python benchmarks/bench_rerun.py --script /tmp/Home_old.py
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import google.generativeai as genai  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from synthetic import make_secrets  # noqa: E402
+
+configure_calls = 0
+_configure = genai.configure
+
+
+def _counting_configure(*args, **kwargs):
+    global configure_calls
+    configure_calls += 1
+    return _configure(*args, **kwargs)
+
+
+genai.configure = _counting_configure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default=str(ROOT / "Home.py"))
+    parser.add_argument("--faqs", type=int, default=200)
+    parser.add_argument("--packages", type=int, default=40)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    at = AppTest.from_file(args.script, default_timeout=120)
+    for section, values in make_secrets(args.faqs, args.packages).items():
+        at.secrets[section] = values
+
+    start = time.perf_counter()
+    at.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise SystemExit(f"Script failed: {at.exception[0].message}")
+
+    timings = []
+    for i in range(args.reruns):
+        start = time.perf_counter()
+        if i % 2:
+            type_box = at.selectbox[0]
+            type_box.set_value(type_box.options[i % len(type_box.options)]).run()
+        else:
+            save = next(b for b in at.button if b.label.endswith("Save Look"))
+            save.click().run()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"script            {args.script}")
+    print(f"cold start        {cold_ms:8.1f} ms")
+    print(f"rerun median      {statistics.median(timings):8.1f} ms")
+    print(f"rerun p95         {sorted(timings)[int(0.95 * (len(timings) - 1))]:8.1f} ms")
+    print(f"genai.configure   {configure_calls:8d} calls over {args.reruns + 1} runs")
+
+
+if __name__ == "__main__":
+    main()
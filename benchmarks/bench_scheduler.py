@@ -0,0 +1,77 @@
+"""Simulated concurrent sessions hitting the stub model through RequestScheduler.
+
+Shows the in-flight cap and 429 retries with backoff. Popular questions asked by different sessions
+are not coalesced: each session's chat has its own history, so each gets its own upstream call.
+Run from the repository root:  python benchmarks/bench_scheduler.py
+"""
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from Home import AgenticAI  # noqa: E402
+from gemini_pool import ChatSessionPool  # noqa: E402
+from scheduler import RequestScheduler  # noqa: E402
+from stub_llm import StubModel  # noqa: E402
+from synthetic import make_faqs, make_packages  # noqa: E402
+
+SESSIONS = 24
+QUESTIONS = ["bridal price for both hands?", "do you travel to gazipur?", "how to make the stain darker?"]
+
+
+def main():
+    context = {"faq": make_faqs(40), "personal": {"name": "Rafiya", "packages": make_packages(20)}}
+    model = StubModel(words=30, first_token_delay=0.3, chunk_delay=0.01, fail_rate=0.2)
+    pool = ChatSessionPool(lambda: model)
+    scheduler = RequestScheduler(max_in_flight=4, requests_per_minute=600, burst=8, deadline=20,
+                                 backoff_initial=0.2, backoff_max=2.0)
+    peak = {"now": 0, "max": 0}
+    lock = threading.Lock()
+    original_send = scheduler._execute
+
+    def tracking_execute(call, expires):
+        def tracked(timeout):
+            with lock:
+                peak["now"] += 1
+                peak["max"] = max(peak["max"], peak["now"])
+            try:
+                return list(call(timeout))
+            finally:
+                with lock:
+                    peak["now"] -= 1
+        return original_send(tracked, expires)
+
+    scheduler._execute = tracking_execute
+    latencies, replies = [], []
+
+    def session(i: int):
+        ai = AgenticAI("offline", context, pool=pool, session_id=f"s{i}", scheduler=scheduler)
+        start = time.perf_counter()
+        # Half the sessions ask one of a few popular questions, the rest ask something unique
+        question = QUESTIONS[i % len(QUESTIONS)] if i % 2 else f"can you do design number {i} on saturday?"
+        replies.append(ai.generate_response(question))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(SESSIONS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    print(f"sessions           {SESSIONS}")
+    print(f"upstream calls     {model.calls} ({model.failures} simulated 429s)")
+    print(f"peak in flight     {peak['max']}")
+    print(f"scheduler          {scheduler.stats()}")
+    print(f"latency median     {statistics.median(latencies) * 1000:.0f} ms, max {max(latencies) * 1000:.0f} ms")
+    print(f"wall time          {wall * 1000:.0f} ms")
+    print(f"busy/error replies {sum(r.startswith(('⏳', '⚠️')) for r in replies)}")
+
+
+if __name__ == "__main__":
+    main()
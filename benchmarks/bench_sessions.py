@@ -0,0 +1,123 @@
+"""Session store: write-through vs batched write-behind on SQLite, resident memory with idle
+eviction, and several processes sharing one database.
+
+Run from the repository root:  python benchmarks/bench_sessions.py
+"""
+import multiprocessing
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from conversation import ConversationMemory  # noqa: E402
+from session_store import SessionData, SessionStore, SQLiteBackend  # noqa: E402
+
+SESSIONS = 2_000
+UPDATES = 5
+
+
+def new_session() -> SessionData:
+    return SessionData(set(), ConversationMemory())
+
+
+def touch(session: SessionData, i: int, step: int):
+    session.favorites.add(f"Look {step}")
+    session.conversation.add(f"question {step} from visitor {i}", "answer " * 40)
+
+
+def bench_writes(path: str, batched: bool) -> float:
+    store = SessionStore(SQLiteBackend(path), new_session, flush_interval=0, retention_days=0)
+    start = time.perf_counter()
+    for step in range(UPDATES):
+        for i in range(SESSIONS):
+            sid = f"{i:032x}"
+            session = store.get(sid)
+            touch(session, i, step)
+            store.mark_dirty(sid, session)
+            if not batched:
+                store.flush([sid])
+        if batched:
+            # What the background thread does every flush_interval
+            store.flush()
+    return time.perf_counter() - start
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def bench_eviction(path: str):
+    """Visitors arrive one per simulated second and stay 2 minutes; only the idle window stays resident."""
+    clock = FakeClock()
+    store = SessionStore(SQLiteBackend(path), new_session, flush_interval=0, idle_ttl=600, retention_days=0, timer=clock)
+    tracemalloc.start()
+    peak_cached = 0
+    for i in range(SESSIONS * 5):
+        clock.now = float(i)
+        sid = f"{i:032x}"
+        session = store.get(sid)
+        touch(session, i, 0)
+        store.mark_dirty(sid, session)
+        if i % 60 == 0:
+            store.flush()
+            store.evict_idle()
+        peak_cached = max(peak_cached, store.stats()["cached"])
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return SESSIONS * 5, peak_cached, current, len(store.backend)
+
+
+def worker(path: str, offset: int, count: int):
+    store = SessionStore(SQLiteBackend(path), new_session, flush_interval=0, retention_days=0)
+    for step in range(UPDATES):
+        for i in range(offset, offset + count):
+            sid = f"{i:032x}"
+            session = store.get(sid)
+            touch(session, i, step)
+            store.mark_dirty(sid, session)
+        store.flush()
+
+
+def bench_processes(path: str, processes: int) -> float:
+    SQLiteBackend(path)
+    start = time.perf_counter()
+    procs = [multiprocessing.Process(target=worker, args=(path, p * SESSIONS, SESSIONS)) for p in range(processes)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    if any(proc.exitcode for proc in procs):
+        raise SystemExit("A writer process failed")
+    return time.perf_counter() - start
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="bench-sessions-")
+    writes = SESSIONS * UPDATES
+    for batched in (False, True):
+        elapsed = bench_writes(f"{workdir}/writes-{batched}.db", batched)
+        mode = "write-behind batches" if batched else "write-through"
+        print(f"{mode:<22} {writes} updates  {elapsed:6.2f} s  {writes / elapsed:9.0f} updates/s")
+
+    visitors, peak_cached, resident, stored = bench_eviction(f"{workdir}/evict.db")
+    print(f"idle eviction          {visitors} visitors  peak resident {peak_cached}  "
+          f"traced memory {resident / 1e6:.1f} MB  stored {stored}")
+
+    for processes in (1, 4):
+        path = f"{workdir}/shared-{processes}.db"
+        elapsed = bench_processes(path, processes)
+        total = processes * SESSIONS * UPDATES
+        print(f"{processes} process(es) sharing  {total} updates  {elapsed:6.2f} s  "
+              f"{total / elapsed:9.0f} updates/s  rows {len(SQLiteBackend(path))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Cold start and per-rerun script overhead of Home.py.
+
+* Import profile: ``python -X importtime`` of the app module in a fresh interpreter, once as the
+  app imports itself now and once with google.generativeai and langdetect imported up front the
+  way Home.py and language.py used to. The difference is what the first chat message now pays.
+* Rerun profile: a cold AppTest run, then warm reruns, split into the ``rerun_<phase>_ms`` phases
+  main() marks (styles, setup, chat, catalog, faq), read back from the app's JSON-lines metrics.
+  A checkout without phase marks reports totals only.
+
+Run from the repository root:  python benchmarks/bench_startup.py [--reruns 20] [--scale 500x200]
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from synthetic import make_secrets  # noqa: E402
+
+HEAVY = ("google.generativeai", "grpc", "langdetect", "streamlit")
+IMPORTS = {
+    "lazy (now)": "import Home",
+    "eager (before)": "import google.generativeai, langdetect; import Home",
+}
+OFFLINE_SECRETS = {
+    "cache": {"response_path": ""},
+    "sessions": {"backend": "memory"},
+}
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(statement: str) -> Tuple[float, Dict[str, float], float]:
+    """Total top-level import ms, cumulative ms of the heavy packages, and process wall ms."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    wall = (time.perf_counter() - start) * 1000
+    total, heavy = 0.0, {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        cumulative_ms, indent, name = int(match.group(2)) / 1000, len(match.group(3)), match.group(4)
+        if indent == 1:
+            total += cumulative_ms
+        if name in HEAVY:
+            heavy[name] = max(heavy.get(name, 0.0), cumulative_ms)
+    return total, heavy, wall
+
+
+def _phase_totals(jsonl_path: Path) -> Dict[str, Tuple[int, float]]:
+    """Per-phase (count, sum) from the app's latest JSON-lines metrics snapshot."""
+    time.sleep(0.3)  # let the exporter thread write a snapshot that includes the last run
+    lines = jsonl_path.read_text(encoding="utf-8").splitlines() if jsonl_path.exists() else []
+    histograms = json.loads(lines[-1])["histograms"] if lines else {}
+    return {
+        name[len("rerun_"):-len("_ms")]: (summary["count"], summary["sum"])
+        for name, summary in histograms.items() if name.startswith("rerun_")
+    }
+
+
+def rerun_profile(secrets: Dict, reruns: int) -> Tuple[float, List[float], Dict[str, Tuple[float, float]]]:
+    """Cold run ms, warm rerun ms, and per phase (cold ms, mean warm ms) when the app marks phases."""
+    jsonl_path = Path(tempfile.mkdtemp(prefix="bench-startup-")) / "metrics.jsonl"
+    secrets = dict(secrets, metrics={"port": 0, "jsonl_path": str(jsonl_path), "flush_interval": 0.1})
+    at = AppTest.from_file(str(ROOT / "Home.py"), default_timeout=600)
+    for section, values in secrets.items():
+        at.secrets[section] = values
+
+    timings, cold_phases = [], {}
+    for i in range(reruns + 1):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise SystemExit(f"Script failed: {at.exception[0].message}")
+        if i == 0:
+            cold_phases = _phase_totals(jsonl_path)
+
+    phases = {}
+    for phase, (count, total) in _phase_totals(jsonl_path).items():
+        cold_count, cold_total = cold_phases.get(phase, (0, 0.0))
+        if count > cold_count:
+            phases[phase] = (cold_total, (total - cold_total) / (count - cold_count))
+    return timings[0], timings[1:], phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per import profile")
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--scale", default="500x200", help="FAQsxpackages of the synthetic studio data")
+    args = parser.parse_args()
+
+    print(f"{'import':>15} {'imports ms':>11} {'process ms':>11}  heavy packages (cumulative ms)")
+    for label, statement in IMPORTS.items():
+        runs = [import_profile(statement) for _ in range(args.repeat)]
+        total = statistics.median(run[0] for run in runs)
+        wall = statistics.median(run[2] for run in runs)
+        heavy = {name: statistics.median(run[1].get(name, 0.0) for run in runs) for name in HEAVY}
+        listed = "  ".join(f"{name} {ms:.0f}" for name, ms in heavy.items() if ms)
+        print(f"{label:>15} {total:>11.1f} {wall:>11.1f}  {listed}", flush=True)
+
+    faqs, packages = (int(n) for n in args.scale.split("x"))
+    secrets = make_secrets(faqs, packages)
+    secrets.update(OFFLINE_SECRETS)
+    cold, warm, phases = rerun_profile(secrets, args.reruns)
+    print(f"\nrerun profile at {args.scale}: cold {cold:.1f} ms, warm median {statistics.median(warm):.1f} ms")
+    if phases:
+        print(f"{'phase':>9} {'cold ms':>8} {'warm mean ms':>13}")
+        for phase, (cold_ms, warm_ms) in phases.items():
+            print(f"{phase:>9} {cold_ms:>8.1f} {warm_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Time-to-first-token vs full reply time for AgenticAI against the offline stub model.
+
+Run from the repository root:  python benchmarks/bench_streaming.py
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from Home import AgenticAI  # noqa: E402
+from gemini_pool import ChatSessionPool  # noqa: E402
+from stub_llm import StubModel  # noqa: E402
+from synthetic import make_faqs, make_packages  # noqa: E402
+
+
+def main():
+    context = {"faq": make_faqs(50), "personal": {"name": "Rafiya", "packages": make_packages(20)}}
+    for first_delay, chunk_delay in ((0.2, 0.02), (0.4, 0.05), (0.8, 0.1)):
+        model = StubModel(words=60, chunk_words=6, first_token_delay=first_delay, chunk_delay=chunk_delay)
+        ai = AgenticAI("offline", context, pool=ChatSessionPool(lambda: model))
+
+        start = time.perf_counter()
+        stream = ai.stream_response("What designs suit a mehndi night?")
+        next(stream)
+        ttft = time.perf_counter() - start
+        rest = "".join(stream)
+        total = time.perf_counter() - start
+        print(f"stub first={first_delay:.2f}s chunk={chunk_delay:.2f}s  ttft {ttft * 1000:7.1f} ms"
+              f"  full {total * 1000:7.1f} ms  chars {len(rest)}")
+
+
+if __name__ == "__main__":
+    main()
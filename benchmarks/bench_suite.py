@@ -0,0 +1,329 @@
+"""Reproducible offline benchmark suite for the whole app, against the deterministic stub LLM.
+
+For each dataset scale (FAQs x packages) it records:
+  * cold start and catalog rerun latency of Home.py, driven headlessly with AppTest
+  * chat turn latency through the Private Studio Lounge tab (FAQ hits and stubbed Gemini replies)
+  * FAQ match time per query, cold (index only) and warm (answer cache)
+  * memory retained per session (tracemalloc) and the size of its session state
+  * throughput and latency of the chat pipeline for N concurrent sessions
+
+AppTest shares Streamlit's process-wide runtime and cannot run scripts in parallel, so the
+concurrency measurement drives the same objects main() wires together (studio data, FAQ handler,
+AgenticAI, chat pool, scheduler, response cache) from one thread per simulated session.
+
+Run from the repository root:
+    python benchmarks/bench_suite.py --out bench-base.json
+    python benchmarks/bench_suite.py --out bench-new.json
+    python benchmarks/bench_suite.py --compare bench-base.json bench-new.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import google.generativeai as genai  # noqa: E402
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from stub_llm import StubModel  # noqa: E402
+from synthetic import make_queries, make_secrets  # noqa: E402
+
+DEFAULT_SCALES = "50x20,500x200,5000x1000"
+
+# Process-local overrides so runs touch neither the network, a metrics port nor the repo's .cache
+OFFLINE_SECRETS = {
+    "metrics": {"port": 0, "jsonl_path": ""},
+    "cache": {"response_path": ""},
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "n": len(values),
+        "median": round(statistics.median(values), 3) if values else 0.0,
+        "p95": round(percentile(values, 0.95), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
+
+
+def install_stub(args):
+    """Routes Home.build_gemini_model to StubModel; every model built afterwards uses these settings."""
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = lambda **kwargs: StubModel(
+        words=args.stub_words,
+        first_token_delay=args.stub_first_token,
+        chunk_delay=args.stub_chunk,
+        system_instruction=kwargs.get("system_instruction"),
+    )
+
+
+def app_secrets(faqs: int, packages: int, args, workdir: str) -> Dict:
+    secrets = make_secrets(faqs, packages)
+    secrets.update(OFFLINE_SECRETS)
+    secrets["sessions"] = {"backend": "sqlite", "path": f"{workdir}/sessions-{faqs}x{packages}.db", "flush_interval": 0.2}
+    # Generous limits: the suite measures the app, not the rate limiter
+    secrets["genai"].update({"max_in_flight": args.max_in_flight, "requests_per_minute": 60_000})
+    return secrets
+
+
+def new_app(secrets: Dict) -> AppTest:
+    at = AppTest.from_file(str(ROOT / "Home.py"), default_timeout=600)
+    for section, values in secrets.items():
+        at.secrets[section] = values
+    return at
+
+
+def checked_run(at: AppTest, action=None) -> float:
+    start = time.perf_counter()
+    (action() if action else at).run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise SystemExit(f"Script failed: {at.exception[0].message}")
+    return elapsed
+
+
+# ---------------------------
+# Scenarios
+# ---------------------------
+def bench_reruns(secrets: Dict, reruns: int) -> Dict:
+    at = new_app(secrets)
+    cold_ms = checked_run(at)
+    warm_ms = checked_run(at)
+    timings = []
+    for i in range(reruns):
+        if i % 2:
+            type_box = at.selectbox[0]
+            timings.append(checked_run(at, lambda: type_box.set_value(type_box.options[i % len(type_box.options)])))
+        else:
+            save = next(b for b in at.button if b.label.endswith("Save Look"))
+            timings.append(checked_run(at, save.click))
+    return {"cold_start_ms": round(cold_ms, 3), "warm_rerun_ms": round(warm_ms, 3), "interaction_rerun_ms": summarize(timings)}
+
+
+def bench_chat(secrets: Dict, queries: List[str]) -> Dict:
+    at = new_app(secrets)
+    checked_run(at)
+    timings = []
+    for query in queries:
+        timings.append(checked_run(at, lambda: at.chat_input[0].set_value(query)))
+    # Older turns are folded into one transcript element, so count FAQ answers in the rendered text
+    faq_hits = sum(m.value.count("🔍 **Studio FAQ:**") for m in at.markdown)
+    return {"turn_ms": summarize(timings), "faq_hit_ratio": round(faq_hits / max(1, len(queries)), 3)}
+
+
+def bench_faq(secrets: Dict, queries: List[str]) -> Dict:
+    from studio_data import build_studio_data
+
+    build_start = time.perf_counter()
+    handler = build_studio_data(secrets).faq_handler
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    def timed_pass() -> List[float]:
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            handler.find_similar_question(query)
+            timings.append((time.perf_counter() - start) * 1e6)
+        return timings
+
+    cold, warm = timed_pass(), timed_pass()
+    return {"build_ms": round(build_ms, 3), "cold_match_us": summarize(cold), "warm_match_us": summarize(warm)}
+
+
+def bench_memory(secrets: Dict, sessions: int, turns: List[str]) -> Dict:
+    # One session first so process-wide resources (indexes, caches, model) are not charged to sessions
+    warmup = new_app(secrets)
+    checked_run(warmup)
+    checked_run(warmup, lambda: warmup.chat_input[0].set_value(turns[0]))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    apps, session_ids = [], []
+    for i in range(sessions):
+        at = new_app(secrets)
+        checked_run(at)
+        for query in turns:
+            checked_run(at, lambda: at.chat_input[0].set_value(f"{query} ({i})"))
+        session_ids.append(at.session_state["session_id"])
+        apps.append(at)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Favorites and chat memory live in the session store; wait for its write-behind flush and read the rows
+    time.sleep(secrets["sessions"]["flush_interval"] * 3)
+    with sqlite3.connect(secrets["sessions"]["path"]) as db:
+        stored = [db.execute("SELECT length(data) FROM sessions WHERE id = ?", (sid,)).fetchone()[0] for sid in session_ids]
+    return {
+        "sessions": sessions,
+        "turns_per_session": len(turns),
+        # Includes AppTest's own element tree for the session, so it is an upper bound
+        "retained_bytes_per_session": (after - before) // sessions,
+        "stored_session_bytes": summarize([float(b) for b in stored]),
+    }
+
+
+def bench_concurrency(secrets: Dict, levels: List[int], turns: int, queries: List[str], args) -> Dict:
+    from conversation import ConversationMemory
+    from gemini_pool import ChatSessionPool
+    from Home import AgenticAI
+    from response_cache import ResponseCache
+    from scheduler import RequestScheduler
+    from studio_data import build_studio_data
+
+    studio = build_studio_data(secrets)
+    results = {}
+    for level in levels:
+        pool = ChatSessionPool(lambda: genai.GenerativeModel(system_instruction=studio.prompt_context.system_instruction))
+        scheduler = RequestScheduler(max_in_flight=args.max_in_flight, requests_per_minute=60_000, burst=args.max_in_flight)
+        cache = ResponseCache(path=None)
+        latencies: List[float] = []
+        lock = threading.Lock()
+
+        def session(index: int):
+            memory = ConversationMemory()
+            ai = AgenticAI(studio.api_key, {"faq": list(studio.faqs), "personal": studio.personal}, response_cache=cache,
+                           pool=pool, session_id=f"bench-{index}", prompt_context=studio.prompt_context, scheduler=scheduler,
+                           memory=memory)
+            for turn in range(turns):
+                query = queries[(index * turns + turn) % len(queries)]
+                start = time.perf_counter()
+                _, answer = studio.faq_handler.find_similar_question(query)
+                if not answer:
+                    answer = "".join(ai.stream_response(query))
+                memory.add(query, answer)
+                with lock:
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(level)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+        results[str(level)] = {
+            "turns": len(latencies),
+            "turns_per_s": round(len(latencies) / wall, 2),
+            "turn_ms": summarize(latencies),
+            "scheduler": scheduler.stats(),
+        }
+    return results
+
+
+# ---------------------------
+# Runner
+# ---------------------------
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_scales(spec: str) -> List[Tuple[int, int]]:
+    return [tuple(int(n) for n in part.split("x")) for part in spec.split(",")]
+
+
+def run_suite(args) -> Dict:
+    install_stub(args)
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "stub": {"words": args.stub_words, "first_token_s": args.stub_first_token, "chunk_s": args.stub_chunk},
+        },
+        "scales": {},
+    }
+    workdir = tempfile.mkdtemp(prefix="bench-suite-")
+    for faqs, packages in parse_scales(args.scales):
+        label = f"{faqs}x{packages}"
+        print(f"== {label} (FAQs x packages)", flush=True)
+        # Every scale starts from empty process-wide caches, as a fresh server process would
+        st.cache_resource.clear()
+        secrets = app_secrets(faqs, packages, args, workdir)
+        queries = make_queries(secrets["faq"]["questions"], max(args.queries, args.chat_turns))
+        result = {
+            "reruns": bench_reruns(secrets, args.reruns),
+            "chat": bench_chat(secrets, queries[:args.chat_turns]),
+            "faq": bench_faq(secrets, queries),
+            "memory": bench_memory(secrets, args.sessions, queries[:3]),
+            "concurrency": bench_concurrency(secrets, args.concurrency, args.turns_per_session, queries, args),
+        }
+        report["scales"][label] = result
+        print(json.dumps(result, indent=2), flush=True)
+    return report
+
+
+def flatten(data, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(old_path: str, new_path: str):
+    """Prints every numeric result that exists in both reports with its relative change."""
+    old = flatten(json.loads(Path(old_path).read_text())["scales"])
+    new = flatten(json.loads(Path(new_path).read_text())["scales"])
+    print(f"{'metric':<60} {'old':>12} {'new':>12} {'change':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        change = f"{(new[key] - old[key]) / old[key] * 100:+.1f}%" if old[key] else "n/a"
+        print(f"{key:<60} {old[key]:>12.3f} {new[key]:>12.3f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="comma-separated FAQSxPACKAGES")
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--chat-turns", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=300, help="queries for the FAQ match timing")
+    parser.add_argument("--sessions", type=int, default=5, help="sessions kept alive for the memory measurement")
+    parser.add_argument("--concurrency", type=lambda s: [int(n) for n in s.split(",")], default=[1, 8, 32])
+    parser.add_argument("--turns-per-session", type=int, default=5)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--stub-words", type=int, default=40)
+    parser.add_argument("--stub-first-token", type=float, default=0.05)
+    parser.add_argument("--stub-chunk", type=float, default=0.005)
+    parser.add_argument("--out", help="JSON report path (default: benchmarks/results/<revision>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="diff two saved reports and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run_suite(args)
+    out = Path(args.out) if args.out else ROOT / "benchmarks" / "results" / f"{report['meta']['revision']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Saved {out}")
+
+
+if __name__ == "__main__":
+    main()
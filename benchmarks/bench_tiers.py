@@ -0,0 +1,111 @@
+"""Answer tiers: share of queries served by FAQ match, the local retrieval tier and the LLM, and
+end-to-end latency against the previous FAQ-or-LLM pipeline.
+
+Queries mix FAQ paraphrases and noise (synthetic.make_queries) with price and contact questions
+built from the synthetic catalog; ``--log`` replays real queries instead, one per line. The stub
+LLM waits ``--first-token`` seconds before replying, like a Gemini round trip.
+
+Run from the repository root:  python benchmarks/bench_tiers.py [--queries 150] [--log queries.txt]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from gemini_pool import ChatSessionPool  # noqa: E402
+from Home import AgenticAI  # noqa: E402
+from studio_data import StudioData, build_studio_data  # noqa: E402
+from stub_llm import StubModel  # noqa: E402
+from synthetic import make_queries, make_secrets  # noqa: E402
+
+PRICE_FRAMES = ["{} price", "how much is {}", "{} koto taka", "what does {} cost", "rate for {}"]
+PROFILE_QUERIES = ["what is your phone number", "where are you located", "email address?", "contact number please"]
+
+
+def studio_queries(studio: StudioData, n: int, seed: int = 17) -> List[str]:
+    """Price questions by package name or facet value, plus contact questions."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.4:
+            subject = rng.choice(studio.packages).name
+        elif roll < 0.8:
+            pkg = rng.choice(studio.packages)
+            subject = " ".join(rng.sample([pkg.type, pkg.length, pkg.hand], 2)).lower()
+        else:
+            queries.append(rng.choice(PROFILE_QUERIES))
+            continue
+        queries.append(rng.choice(PRICE_FRAMES).format(subject))
+    return queries
+
+
+def run(studio: StudioData, queries: List[str], local: bool, first_token: float):
+    model = StubModel(words=60, first_token_delay=first_token, chunk_delay=0.0)
+    ai = AgenticAI("offline", {"faq": list(studio.faqs), "personal": studio.personal},
+                   pool=ChatSessionPool(lambda: model), prompt_context=studio.prompt_context)
+    tiers, latencies = Counter(), {}
+    for query in queries:
+        start = time.perf_counter()
+        _, faq_a = studio.faq_handler.find_similar_question(query)
+        answer = studio.retriever.answer(query) if local and not faq_a else None
+        if faq_a:
+            tier, reply = "faq", faq_a
+        elif answer:
+            tier, reply = "local", answer.text
+        else:
+            tier, reply = "llm", "".join(ai.stream_response(query))
+        latencies.setdefault(tier, []).append((time.perf_counter() - start) * 1000)
+        tiers[tier] += 1
+    return tiers, latencies, model.calls
+
+
+def p95(values: List[float]) -> float:
+    return sorted(values)[max(0, int(len(values) * 0.95) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=150)
+    parser.add_argument("--faqs", type=int, default=500)
+    parser.add_argument("--packages", type=int, default=200)
+    parser.add_argument("--first-token", type=float, default=0.4, help="stub LLM seconds to first token")
+    parser.add_argument("--log", help="file with one user query per line to replay instead of synthetic ones")
+    args = parser.parse_args()
+
+    secrets = make_secrets(args.faqs, args.packages)
+    secrets["personal"]["data"].update({"phone": "01323278403", "address": "Mirpur, Dhaka", "email": "studio@example.com"})
+    studio = build_studio_data(secrets)
+    if args.log:
+        queries = [line.strip() for line in Path(args.log).read_text(encoding="utf-8").splitlines() if line.strip()]
+    else:
+        half = args.queries // 2
+        queries = make_queries([{"question": faq.question} for faq in studio.faqs], half)
+        queries += studio_queries(studio, args.queries - half)
+        random.Random(3).shuffle(queries)
+
+    print(f"{len(queries)} queries, {len(studio.faqs)} FAQs, {len(studio.packages)} packages, stub first token {args.first_token} s")
+    print(f"{'pipeline':>13} {'tier':>6} {'share':>7} {'median ms':>10} {'p95 ms':>9}")
+    for local in (False, True):
+        # Fresh snapshot per pipeline so neither run starts with the other's warm answer caches
+        tiers, latencies, calls = run(build_studio_data(secrets), queries, local, args.first_token)
+        name = "faq+local+llm" if local else "faq+llm"
+        for tier in ("faq", "local", "llm"):
+            if tiers[tier]:
+                values = latencies[tier]
+                print(f"{name:>13} {tier:>6} {tiers[tier] / len(queries):>7.1%} "
+                      f"{statistics.median(values):>10.1f} {p95(values):>9.1f}", flush=True)
+        overall = [ms for values in latencies.values() for ms in values]
+        print(f"{name:>13} {'all':>6} {1:>7.0%} {statistics.median(overall):>10.1f} {p95(overall):>9.1f}  "
+              f"LLM calls {calls}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
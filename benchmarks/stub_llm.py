@@ -0,0 +1,116 @@
+"""Deterministic offline stand-in for google.generativeai models.
+
+StubModel mimics the parts of GenerativeModel / ChatSession the app uses:
+start_chat(), send_message(prompt) and send_message(prompt, stream=True).
+"""
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+
+class StubAPIError(Exception):
+    """Carries an HTTP status in ``.code`` like google.api_core exceptions (e.g. 429 ResourceExhausted)."""
+
+    def __init__(self, code: int = 429, message: str = "Resource has been exhausted (stub)"):
+        super().__init__(message)
+        self.code = code
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubChat:
+    """Keeps history as plain strings; ``start_chat(history=...)`` contents are flattened to their text parts."""
+
+    def __init__(self, model: "StubModel", history: Optional[List[Dict]] = None):
+        self.model = model
+        self.history: List[str] = [str(content["parts"][0]) for content in history or []]
+
+    def send_message(self, prompt: str, stream: bool = False, **kwargs):
+        # Like the real API, every request resends the whole chat history
+        sent_chars = sum(map(len, self.history)) + len(prompt)
+        self.model.sent_chars.append(sent_chars)
+        self.history.append(prompt)
+        self.model.calls += 1
+        if self.model.should_fail():
+            time.sleep(self.model.first_token_delay / 4)
+            raise StubAPIError(self.model.error_code)
+        if self.model.empty_replies > 0:
+            self.model.empty_replies -= 1
+            chunks: List[str] = []
+        else:
+            chunks = self.model.reply_chunks(prompt)
+        self.history.append("".join(chunks))
+        first_token_delay = self.model.first_token_delay + self.model.prefill_delay * sent_chars / 1000
+        if stream:
+            return self._stream(chunks, first_token_delay)
+        time.sleep(first_token_delay + self.model.chunk_delay * max(0, len(chunks) - 1))
+        return StubResponse("".join(chunks))
+
+    def _stream(self, chunks: List[str], first_token_delay: float) -> Iterator[StubResponse]:
+        time.sleep(first_token_delay)
+        for i, chunk in enumerate(chunks):
+            if i:
+                time.sleep(self.model.chunk_delay)
+            yield StubResponse(chunk)
+
+
+class StubModel:
+    """Replies with `words` deterministic words split into chunks of `chunk_words`, after configurable delays.
+
+    `fail_first` / `fail_rate` make send_message raise StubAPIError (429 by default) to exercise retries.
+    `prefill_delay` adds seconds per 1000 characters of history plus prompt, so long chats answer slower.
+    """
+
+    def __init__(
+        self,
+        words: int = 60,
+        chunk_words: int = 6,
+        first_token_delay: float = 0.4,
+        chunk_delay: float = 0.05,
+        prefill_delay: float = 0.0,
+        empty_replies: int = 0,
+        fail_first: int = 0,
+        fail_rate: float = 0.0,
+        error_code: int = 429,
+        seed: int = 5,
+        system_instruction: Optional[str] = None,
+    ):
+        self.words = words
+        self.chunk_words = chunk_words
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.prefill_delay = prefill_delay
+        self.empty_replies = empty_replies
+        self.fail_first = fail_first
+        self.fail_rate = fail_rate
+        self.error_code = error_code
+        self.system_instruction = system_instruction
+        self.calls = 0
+        self.sent_chars: List[int] = []
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def should_fail(self) -> bool:
+        """First `fail_first` calls fail, then each call fails with probability `fail_rate`."""
+        with self._lock:
+            fail = self.fail_first > 0 or self._rng.random() < self.fail_rate
+            if self.fail_first > 0:
+                self.fail_first -= 1
+            self.failures += fail
+            return fail
+
+    def reply_chunks(self, prompt: str) -> List[str]:
+        seed = sum(map(ord, prompt)) % 97
+        words = [f"henna{(seed + i) % 97}" for i in range(self.words)]
+        return [
+            " ".join(words[i:i + self.chunk_words]) + " "
+            for i in range(0, len(words), self.chunk_words)
+        ]
+
+    def start_chat(self, history: Optional[List[Dict]] = None, **kwargs) -> StubChat:
+        return StubChat(self, history)
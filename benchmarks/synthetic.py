@@ -0,0 +1,86 @@
+import random
+from typing import Dict, List
+
+# ---------------------------
+# Synthetic Studio Datasets
+# ---------------------------
+TOPICS = [
+    "bridal henna", "party henna", "organic cone", "henna stain", "aftercare",
+    "home service", "training course", "booking deposit", "travel charge", "design length",
+    "mehndi night", "arabic pattern", "finger tips", "feet coverage", "natural dye",
+]
+FRAMES = [
+    "how much does {t} cost",
+    "what is the price of {t}",
+    "how long does {t} last",
+    "do you offer {t} in dhaka",
+    "can i book {t} for next week",
+    "is {t} safe for sensitive skin",
+    "koto taka lagbe {t} er jonno",
+    "{t} ki available ache",
+]
+CATEGORIES = ["pricing", "care", "booking", "training", "products"]
+
+
+def make_faqs(n: int, seed: int = 7) -> List[Dict]:
+    """Builds n distinct FAQ rows by crossing topics, frames and a numbered variant tag."""
+    rng = random.Random(seed)
+    faqs = []
+    for i in range(n):
+        topic = TOPICS[i % len(TOPICS)]
+        frame = FRAMES[(i // len(TOPICS)) % len(FRAMES)]
+        question = frame.format(t=topic)
+        if i >= len(TOPICS) * len(FRAMES):
+            question = f"{question} option {i}"
+        faqs.append({
+            "question": question.capitalize() + "?",
+            "answer": f"Answer {i}: please message us about {topic}.",
+            "category": rng.choice(CATEGORIES),
+        })
+    return faqs
+
+
+def make_queries(faqs: List[Dict], n: int, seed: int = 11) -> List[str]:
+    """Mixes near-duplicate paraphrases of FAQ questions with off-topic noise queries."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        if rng.random() < 0.7:
+            q = list(rng.choice(faqs)["question"].lower().rstrip("?"))
+            for _ in range(rng.randint(0, 3)):
+                pos = rng.randrange(len(q))
+                q[pos] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+            queries.append("".join(q))
+        else:
+            queries.append(" ".join(rng.choice(TOPICS + ["weather", "cricket", "hello"]) for _ in range(3)))
+    return queries
+
+
+def make_packages(n: int, seed: int = 13) -> List[Dict]:
+    """Builds n catalog packages with the facet fields the Curated Collections tab filters on."""
+    rng = random.Random(seed)
+    types = ["Bridal", "Non-Bridal", "Engagement", "Party", "Kids"]
+    lengths = ["Fingertips", "Wrist", "Mid-Arm", "Elbow", "Full Arm"]
+    hands = ["One Hand", "Both Hands"]
+    sides = ["Front", "Back", "Front & Back"]
+    return [
+        {
+            "name": f"{rng.choice(['Royal', 'Classic', 'Minimal', 'Floral', 'Arabic'])} Look {i}",
+            "type": rng.choice(types),
+            "length": rng.choice(lengths),
+            "hand": rng.choice(hands),
+            "side": rng.choice(sides),
+            "price": rng.randrange(500, 20_000, 50),
+            "description": f"Hand-drawn design number {i} with organic henna paste.",
+        }
+        for i in range(n)
+    ]
+
+
+def make_secrets(faqs: int, packages: int) -> Dict:
+    """Secrets layout read by load_studio_data, with a dummy API key."""
+    return {
+        "genai": {"api_key": "offline-benchmark"},
+        "faq": {"questions": make_faqs(faqs)},
+        "personal": {"data": {"name": "Rafiya", "packages": make_packages(packages)}},
+    }
@@ -0,0 +1,88 @@
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Tuple
+
+FACETS = ("type", "length", "hand", "side")
+ALL = "All"
+
+
+def _bitmap(ids: Iterable[int], size: int) -> int:
+    # Setting bits in a bytearray is linear; OR-ing 1 << i into a growing int is quadratic
+    buf = bytearray((size + 7) // 8)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+# ---------------------------
+# Catalog Facet Index
+# ---------------------------
+class CatalogIndex:
+    """Precomputed facet bitmaps over the package catalog.
+
+    Packages get internal ids in ascending price order, so each filter state is a single int bitmap:
+    facet narrowing is ``&``, a budget cap is a low-bit mask found with bisect, and the cheapest /
+    dearest remaining package are the lowest / highest set bits.
+    """
+
+    def __init__(self, packages: List[Dict]):
+        order = sorted(range(len(packages)), key=lambda i: (packages[i]['price'], i))
+        self.packages: List[Dict] = [packages[i] for i in order]
+        # Catalog position of each internal id, so results keep the order the studio listed them in
+        self.positions: List[int] = order
+        self.prices: List = [p['price'] for p in self.packages]
+        self.all_bits: int = (1 << len(self.packages)) - 1
+        self._ids_by_name: Dict[str, List[int]] = {}
+        for i, pkg in enumerate(self.packages):
+            self._ids_by_name.setdefault(pkg['name'], []).append(i)
+
+        self.facets: Dict[str, List[Tuple[str, int]]] = {}
+        for facet in FACETS:
+            ids: Dict[str, List[int]] = {}
+            for i, pkg in enumerate(self.packages):
+                ids.setdefault(pkg.get(facet), []).append(i)
+            self.facets[facet] = sorted(
+                ((value, _bitmap(value_ids, len(self.packages))) for value, value_ids in ids.items()),
+                key=lambda kv: str(kv[0]),
+            )
+
+    def __len__(self) -> int:
+        return len(self.packages)
+
+    def options(self, facet: str, bits: int = -1) -> List[str]:
+        """Facet values still present among the candidate packages, sorted."""
+        return [value for value, value_bits in self.facets[facet] if value_bits & bits]
+
+    def narrow(self, bits: int, facet: str, value: str) -> int:
+        if value == ALL:
+            return bits
+        for candidate, value_bits in self.facets[facet]:
+            if candidate == value:
+                return bits & value_bits
+        return 0
+
+    def price_range(self, bits: int) -> Tuple:
+        if not bits:
+            return 0, 0
+        low = (bits & -bits).bit_length() - 1
+        return self.prices[low], self.prices[bits.bit_length() - 1]
+
+    def at_most(self, bits: int, max_price) -> int:
+        return bits & ((1 << bisect_right(self.prices, max_price)) - 1)
+
+    def ids(self, bits: int) -> List[int]:
+        """Set bit positions in catalog order."""
+        text = bin(bits)[:1:-1]
+        found, pos = [], text.find("1")
+        while pos != -1:
+            found.append(pos)
+            pos = text.find("1", pos + 1)
+        found.sort(key=self.positions.__getitem__)
+        return found
+
+    def materialize(self, bits: int) -> List[Dict]:
+        return [self.packages[i] for i in self.ids(bits)]
+
+    def by_names(self, names: Iterable[str]) -> List[Dict]:
+        """Packages for the given names in catalog order; names no longer in the catalog are skipped."""
+        ids = [i for name in names for i in self._ids_by_name.get(name, ())]
+        return self.materialize(_bitmap(ids, len(self.packages)))
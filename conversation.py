@@ -0,0 +1,126 @@
+import re
+from typing import Dict, List
+
+from prompt_context import estimate_tokens
+
+_TAGS_RE = re.compile(r"<[^>]+>")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?।])\s")
+
+
+def first_sentence(text: str, limit: int) -> str:
+    """First sentence of a message with markup and whitespace collapsed, cut to ``limit`` characters."""
+    flat = " ".join(_TAGS_RE.sub(" ", text or "").split())
+    sentence = _SENTENCE_END_RE.split(flat, maxsplit=1)[0]
+    return sentence if len(sentence) <= limit else sentence[:limit - 1].rstrip() + "…"
+
+
+# ---------------------------
+# Bounded Conversation Memory
+# ---------------------------
+class ConversationMemory:
+    """Per-session chat memory with a token budget.
+
+    The last ``keep_turns`` exchanges stay verbatim (fewer if they exceed ``token_budget``); older ones
+    are folded into an extractive summary capped at ``summary_budget`` tokens. The upstream chat is
+    seeded from ``seed_history()`` so Gemini only ever receives the summary plus the verbatim window.
+    The display log keeps at most ``max_log`` turns. Plain attributes only, so it pickles with session state.
+    """
+
+    def __init__(self, keep_turns: int = 6, token_budget: int = 1200, summary_budget: int = 300, max_log: int = 100):
+        self.keep_turns = max(1, keep_turns)
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.max_log = max(max_log, self.keep_turns)
+        self.turns: List[Dict[str, str]] = []
+        self.window = 0
+        self.summary_lines: List[str] = []
+        self.dropped_topics = 0
+        self.total_turns = 0
+        # Set when folding changed what the upstream chat should hold; cleared once it is re-seeded
+        self.stale = False
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def add(self, user: str, bot: str) -> bool:
+        """Records one exchange; returns True when older turns were folded into the summary."""
+        self.turns.append({"user": user, "bot": bot})
+        self.window += 1
+        self.total_turns += 1
+        folded = False
+        while self.window > self.keep_turns or (self.window > 1 and self._window_tokens() > self.token_budget):
+            self._fold(self.turns[-self.window])
+            self.window -= 1
+            folded = True
+        del self.turns[:max(0, len(self.turns) - self.max_log)]
+        self.stale = self.stale or folded
+        return folded
+
+    def _window_tokens(self) -> int:
+        return sum(estimate_tokens(t["user"]) + estimate_tokens(t["bot"]) for t in self.recent())
+
+    def _fold(self, turn: Dict[str, str]):
+        line = f"- Asked: {first_sentence(turn['user'], 100)} → {first_sentence(turn['bot'], 140)}"
+        if line in self.summary_lines:
+            return
+        self.summary_lines.append(line)
+        while len(self.summary_lines) > 1 and estimate_tokens("\n".join(self.summary_lines)) > self.summary_budget:
+            self.summary_lines.pop(0)
+            self.dropped_topics += 1
+
+    def recent(self) -> List[Dict[str, str]]:
+        return self.turns[-self.window:] if self.window else []
+
+    def older(self) -> List[Dict[str, str]]:
+        """Folded turns still kept for display, oldest first."""
+        return self.turns[:len(self.turns) - self.window]
+
+    @property
+    def summary(self) -> str:
+        if not self.summary_lines:
+            return ""
+        head = f"(+{self.dropped_topics} earlier topics)\n" if self.dropped_topics else ""
+        return head + "\n".join(self.summary_lines)
+
+    def seed_history(self) -> List[Dict]:
+        """Gemini ``start_chat(history=...)`` contents: the summary as one exchange, then the verbatim window."""
+        history: List[Dict] = []
+        if self.summary_lines:
+            history.append({"role": "user", "parts": [f"Summary of our earlier conversation:\n{self.summary}"]})
+            history.append({"role": "model", "parts": ["Noted, I will keep that in mind."]})
+        for turn in self.recent():
+            history.append({"role": "user", "parts": [turn["user"]]})
+            history.append({"role": "model", "parts": [turn["bot"]]})
+        return history
+
+    def context_tokens(self) -> int:
+        """Estimated tokens the seeded history adds to every upstream request."""
+        return sum(estimate_tokens(content["parts"][0]) for content in self.seed_history())
+
+    def to_dict(self) -> Dict:
+        return {
+            "turns": [dict(turn) for turn in list(self.turns)],
+            "window": self.window,
+            "summary_lines": list(self.summary_lines),
+            "dropped_topics": self.dropped_topics,
+            "total_turns": self.total_turns,
+        }
+
+    def restore(self, state: Dict):
+        """Loads a ``to_dict()`` snapshot; the limits stay as configured on this instance."""
+        self.turns = [{"user": t["user"], "bot": t["bot"]} for t in state.get("turns", [])][-self.max_log:]
+        self.window = min(int(state.get("window", 0)), len(self.turns))
+        self.summary_lines = list(state.get("summary_lines", []))
+        self.dropped_topics = int(state.get("dropped_topics", 0))
+        self.total_turns = int(state.get("total_turns", len(self.turns)))
+        # A process that never held this session has no upstream chat yet; it is seeded on first use
+        self.stale = False
+
+    def clear(self):
+        self.turns.clear()
+        self.window = 0
+        self.summary_lines.clear()
+        self.dropped_topics = 0
+        self.total_turns = 0
+        self.stale = False
+
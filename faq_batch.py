@@ -0,0 +1,134 @@
+"""Bulk FAQ evaluation: replays logged questions against an FAQ set in vectorized chunks.
+
+Usage:  python faq_batch.py secrets.toml questions.txt > matches.jsonl
+"""
+import json
+import sys
+import zlib
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+import toml
+
+from faq_index import char_ngrams
+from query_cache import normalize_query
+
+
+class BatchMatch(NamedTuple):
+    query: str
+    question: Optional[str]
+    answer: Optional[str]
+    score: float
+    runner_up: Optional[str]
+    runner_up_score: float
+
+
+# ---------------------------
+# Hashed N-gram Vectorizer
+# ---------------------------
+def _bucket(gram: str, dim: int) -> int:
+    # crc32 instead of hash() so vectors are stable across processes
+    return zlib.crc32(gram.encode("utf-8")) % dim
+
+
+class FAQBatchMatcher:
+    """Scores many queries against every FAQ question with one similarity matrix product per chunk."""
+
+    def __init__(self, faq_list: List[Dict], dim: int = 2048, top_k: int = 16, chunk_size: int = 512):
+        self.faq_list = faq_list
+        self.dim = dim
+        self.top_k = min(max(2, top_k), len(faq_list))
+        self.chunk_size = chunk_size
+        self.questions: List[str] = [normalize_query(faq['question']) for faq in faq_list]
+
+        counts = self._counts(self.questions)
+        df = np.count_nonzero(counts, axis=0)
+        self.idf = np.log1p(len(self.questions) / (1.0 + df)).astype(np.float32)
+        self.matrix = self._normalize(counts * self.idf)
+
+    def _counts(self, texts: List[str]) -> np.ndarray:
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            for gram in char_ngrams(text):
+                rows.append(row)
+                cols.append(_bucket(gram, self.dim))
+        counts = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+        return counts
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _match_chunk(self, queries: List[str], threshold: float) -> List[BatchMatch]:
+        # Same normalization as FAQHandler, so replayed logs match like live traffic
+        cleaned = [normalize_query(q) for q in queries]
+        sims = self._normalize(self._counts(cleaned) * self.idf) @ self.matrix.T
+        if self.top_k == 0:
+            shortlist = np.empty((len(queries), 0), dtype=np.intp)
+        elif self.top_k < sims.shape[1]:
+            shortlist = np.argpartition(-sims, self.top_k - 1, axis=1)[:, :self.top_k]
+        else:
+            shortlist = np.broadcast_to(np.arange(sims.shape[1]), sims.shape)
+
+        results = []
+        for query, text, candidates in zip(queries, cleaned, shortlist):
+            # Exact rescoring keeps scores on the same scale as FAQHandler's threshold
+            matcher = SequenceMatcher(None, text, "")
+            scored = []
+            for doc_id in np.sort(candidates):
+                matcher.set_seq2(self.questions[doc_id])
+                scored.append((matcher.ratio(), -int(doc_id)))
+            # Negated ids make ties resolve to the earliest FAQ entry, as in the linear scan
+            scored.sort(reverse=True)
+            scored += [(0.0, None)] * (2 - len(scored))
+            (best, best_id), (second, second_id) = scored[0], scored[1]
+            # Like the linear scan, nothing matches when every ratio is 0, even at threshold 0
+            hit = best_id is not None and best > 0 and best >= threshold
+            results.append(BatchMatch(
+                query=query,
+                question=self.faq_list[-best_id]['question'] if hit else None,
+                answer=self.faq_list[-best_id]['answer'] if hit else None,
+                score=best,
+                runner_up=self.faq_list[-second_id]['question'] if second_id is not None else None,
+                runner_up_score=second,
+            ))
+        return results
+
+    def match_batch(self, queries: List[str], threshold: float = 0.65) -> List[BatchMatch]:
+        """Returns the best match, its score and the runner-up for every query."""
+        results: List[BatchMatch] = []
+        for start in range(0, len(queries), self.chunk_size):
+            results.extend(self._match_chunk(queries[start:start + self.chunk_size], threshold))
+        return results
+
+    def iter_matches(self, queries: Iterable[str], threshold: float = 0.65) -> Iterator[BatchMatch]:
+        """Streaming variant; holds at most one chunk of queries in memory at a time."""
+        chunk: List[str] = []
+        for query in queries:
+            chunk.append(query)
+            if len(chunk) >= self.chunk_size:
+                yield from self._match_chunk(chunk, threshold)
+                chunk = []
+        if chunk:
+            yield from self._match_chunk(chunk, threshold)
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 3:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    faq_list = toml.load(argv[1]).get("faq", {}).get("questions", [])
+    matcher = FAQBatchMatcher(faq_list)
+    with open(argv[2], encoding="utf-8") as log:
+        lines = (line.rstrip("\n") for line in log if line.strip())
+        for match in matcher.iter_matches(lines):
+            sys.stdout.write(json.dumps(match._asdict(), ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
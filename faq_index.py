@@ -0,0 +1,147 @@
+import math
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from query_cache import MISSING, AnswerCache, normalize_query
+
+# ---------------------------
+# Character N-gram Postings
+# ---------------------------
+NGRAM_SIZE = 3
+
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> List[str]:
+    """Splits a cleaned string into padded character n-grams for index lookups."""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return [padded]
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+def _top(scores: Dict[int, float], k: int) -> List[Tuple[int, float]]:
+    return sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+
+
+class NgramBM25:
+    """Inverted character n-gram index over a list of texts, scored with BM25."""
+
+    def __init__(self, texts: List[str], k1: float = 1.2, b: float = 0.75):
+        self.texts = texts
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.idf: Dict[str, float] = {}
+        self.doc_norms: List[float] = []
+        self._build()
+
+    def _build(self):
+        lengths = []
+        for doc_id, text in enumerate(self.texts):
+            grams = Counter(char_ngrams(text))
+            lengths.append(sum(grams.values()))
+            for gram, tf in grams.items():
+                self.postings[gram].append((doc_id, tf))
+
+        total = len(self.texts)
+        avg_len = (sum(lengths) / total) if total else 0.0
+        for gram, plist in self.postings.items():
+            df = len(plist)
+            self.idf[gram] = math.log(1 + (total - df + 0.5) / (df + 0.5))
+        # Length normalisation folded into a per-document constant once at build time
+        self.doc_norms = [
+            self.k1 * (1 - self.b + self.b * (length / avg_len if avg_len else 0.0))
+            for length in lengths
+        ]
+
+    def scores(self, cleaned_input: str) -> Dict[int, float]:
+        """BM25 score of every document sharing at least one n-gram with the input."""
+        scores: Dict[int, float] = defaultdict(float)
+        for gram in set(char_ngrams(cleaned_input)):
+            plist = self.postings.get(gram)
+            if not plist:
+                continue
+            idf = self.idf[gram]
+            for doc_id, tf in plist:
+                scores[doc_id] += idf * (tf * (self.k1 + 1)) / (tf + self.doc_norms[doc_id])
+        return scores
+
+    def rank(self, cleaned_input: str, k: int) -> List[Tuple[int, float]]:
+        """Top-k (doc_id, score) pairs, best first."""
+        return _top(self.scores(cleaned_input), k)
+
+
+class FAQIndex(NgramBM25):
+    """Question index with BM25 shortlisting and exact SequenceMatcher rescoring.
+
+    The shortlist is approximate: only the ``top_k`` questions sharing the most weighted n-grams are
+    rescored, so the linear scan's best match is occasionally missed when it shares few n-grams with
+    the query (about 1% of noisy queries at 1k FAQs in benchmarks/bench_faq_matching.py). Sets of at
+    most ``top_k`` questions are scanned in full and match exactly.
+
+    Questions are stored as ``normalize_query`` output; callers pass queries normalized the same way.
+    """
+
+    def __init__(self, faq_list: List[Dict], top_k: int = 8, k1: float = 1.2, b: float = 0.75):
+        self.faq_list = faq_list
+        self.top_k = top_k
+        self.questions: List[str] = [normalize_query(faq['question']) for faq in faq_list]
+        super().__init__(self.questions, k1=k1, b=b)
+
+    def shortlist(self, cleaned_input: str) -> List[int]:
+        """Returns up to top_k document ids ranked by BM25 over shared n-grams, in FAQ order."""
+        scores = self.scores(cleaned_input)
+        if len(scores) <= self.top_k:
+            return sorted(scores)
+        return sorted(doc_id for doc_id, _ in _top(scores, self.top_k))
+
+    def best_match(self, cleaned_input: str, threshold: float) -> Tuple[Optional[str], Optional[str], float]:
+        """Best match among the shortlisted questions; ties resolve to the earliest FAQ entry like the linear scan."""
+        if len(self.questions) <= self.top_k:
+            candidates = range(len(self.questions))
+        else:
+            candidates = self.shortlist(cleaned_input)
+
+        best_id, highest = None, 0.0
+        # Same argument order as the original scan so ratios match bit-for-bit
+        matcher = SequenceMatcher(None, cleaned_input, "")
+        for doc_id in candidates:
+            matcher.set_seq2(self.questions[doc_id])
+            if matcher.real_quick_ratio() <= highest or matcher.quick_ratio() <= highest:
+                continue
+            sim = matcher.ratio()
+            if sim > highest:
+                highest, best_id = sim, doc_id
+
+        if best_id is None or highest < threshold:
+            return None, None, highest
+        faq = self.faq_list[best_id]
+        return faq['question'], faq['answer'], highest
+
+
+# ---------------------------
+# FAQ Lookup Service
+# ---------------------------
+class FAQHandler:
+    def __init__(self, faq_list: List[Dict], cache_size: int = 4096, cache_ttl: float = 6 * 3600):
+        self.faq_list = faq_list
+        # Prebuilt n-gram index, constructed once so lookups only rescore a shortlist
+        self.index = FAQIndex(faq_list)
+        # Bounded answer cache keyed by normalized query; misses are cached as (None, None)
+        self.faq_cache = AnswerCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def find_similar_question(self, user_input: str, threshold: float = 0.65) -> Tuple[Optional[str], Optional[str]]:
+        normalized = normalize_query(user_input)
+        cache_key = (normalized, threshold)
+        
+        # Immediate memory check return to bypass execution cycles
+        cached = self.faq_cache.get(cache_key)
+        if cached is not MISSING:
+            return cached
+            
+        # Matched on the cache key itself, so every variant sharing a key gets the same answer
+        best_q, best_a, _ = self.index.best_match(normalized, threshold)
+        result = (best_q, best_a) if best_q is not None else (None, None)
+        # Commit tracking coordinates into data layout
+        self.faq_cache.set(cache_key, result)
+        return result
@@ -0,0 +1,74 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------
+# Process-Level Chat Pool
+# ---------------------------
+class ChatSessionPool:
+    """Builds the generative model once per process and hands out per-session chat handles on first use.
+
+    Handles not touched for ``idle_ttl`` seconds are released so abandoned browser tabs do not pin memory.
+    """
+
+    def __init__(
+        self,
+        model_factory: Callable[[], Any],
+        idle_ttl: float = 30 * 60,
+        sweep_interval: float = 60.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self._model_factory = model_factory
+        self._model: Optional[Any] = None
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self.timer = timer
+        self._lock = threading.RLock()
+        self._sessions: Dict[str, Tuple[Any, float]] = {}
+        self._last_sweep = timer()
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._model_factory()
+        return self._model
+
+    def get_chat(self, session_id: str, history: Optional[List[Dict]] = None) -> Any:
+        """Returns this session's chat, starting one (seeded with ``history``) on first use or after release."""
+        self.release_idle()
+        now = self.timer()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            chat = entry[0] if entry else self.model.start_chat(history=history or None)
+            self._sessions[session_id] = (chat, now)
+            return chat
+
+    def replace_chat(self, session_id: str, chat: Any):
+        with self._lock:
+            self._sessions[session_id] = (chat, self.timer())
+
+    def reset(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def release_idle(self, force: bool = False) -> int:
+        now = self.timer()
+        if not force and now - self._last_sweep < self.sweep_interval:
+            return 0
+        with self._lock:
+            self._last_sweep = now
+            stale = [sid for sid, (_, used) in self._sessions.items() if now - used > self.idle_ttl]
+            for sid in stale:
+                del self._sessions[sid]
+        if stale:
+            logger.info(f"Released {len(stale)} idle chat sessions.")
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
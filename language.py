@@ -0,0 +1,75 @@
+import re
+from functools import lru_cache
+
+from query_cache import normalize_query
+
+LANGUAGE_NAMES = {
+    "bn": "Bangla (Bengali script)",
+    "banglish": "Banglish (Bangla written in English letters)",
+    "en": "English",
+}
+
+# Frequent romanized Bangla words; English words that collide ("ki", "na" aside) are left out
+BANGLISH_MARKERS = frozenset({
+    "ami", "amar", "amake", "apni", "apnar", "apnake", "tumi", "tomar", "koto", "taka", "ki",
+    "ache", "nei", "kemon", "kivabe", "korte", "korbo", "korben", "kore", "chai", "hobe", "hoy",
+    "lagbe", "jonno", "kothay", "kobe", "din", "ta", "ti", "er", "ar", "o", "na", "vai", "apu",
+    "bolen", "bolun", "dekhte", "pabo", "jabe", "parben", "mehedi", "dam", "shathe", "sathe",
+})
+ENGLISH_MARKERS = frozenset({
+    "the", "is", "are", "what", "how", "much", "do", "you", "can", "for", "of", "and", "a", "an",
+    "does", "your", "my", "price", "i", "to", "in", "with", "have", "which", "when", "where",
+})
+BENGALI_FIRST, BENGALI_LAST = "\u0980", "\u09ff"
+_WORD_RE = re.compile(r"[a-z']+")
+
+
+def _bengali_ratio(text: str) -> float:
+    letters = [ch for ch in text if ch.isalpha() or BENGALI_FIRST <= ch <= BENGALI_LAST]
+    if not letters:
+        return 0.0
+    return sum(BENGALI_FIRST <= ch <= BENGALI_LAST for ch in letters) / len(letters)
+
+
+@lru_cache(maxsize=1)
+def _langdetect():
+    """Imported on first ambiguous query; most queries are routed by the heuristics alone."""
+    import langdetect
+
+    # Deterministic langdetect: without a seed the same text can come back as different languages
+    langdetect.DetectorFactory.seed = 0
+    return langdetect
+
+
+@lru_cache(maxsize=8192)
+def _route(normalized: str) -> str:
+    if not normalized:
+        return "en"
+    if _bengali_ratio(normalized) >= 0.3:
+        return "bn"
+
+    if sum(ch.isascii() for ch in normalized) / len(normalized) >= 0.9:
+        words = _WORD_RE.findall(normalized)
+        banglish = sum(w in BANGLISH_MARKERS for w in words)
+        english = sum(w in ENGLISH_MARKERS for w in words)
+        if banglish > english:
+            return "banglish"
+        # Without a single Banglish marker ("bridal mehndi") langdetect only guesses among Latin languages
+        if english > banglish or not banglish:
+            return "en"
+
+    # Ambiguous (tied markers, mixed scripts): fall back to the seeded statistical detector
+    langdetect = _langdetect()
+    try:
+        detected = langdetect.detect(normalized)
+    except langdetect.lang_detect_exception.LangDetectException:
+        return "en"
+    if detected in ("bn", "en"):
+        return detected
+    # langdetect has no Banglish profile and labels it as assorted Latin-script languages
+    return "banglish" if normalized.isascii() else detected
+
+
+def detect_language(text: str) -> str:
+    """Routes a query to "bn", "banglish", "en" (or another langdetect code); memoized per normalized string."""
+    return _route(normalize_query(text))
@@ -0,0 +1,160 @@
+"""Page CSS and HTML fragments: static markup, package cards and knowledge-base answers.
+
+Streamlit re-executes Home.py as a fresh ``__main__`` module on every rerun, so caches defined
+there start empty each time; this module is imported once per process and its caches persist.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Tuple
+
+
+def minify_markup(markup: str) -> str:
+    """Drops CSS comments and indentation so every rerun sends fewer bytes to the browser."""
+    return re.sub(r"\s*\n\s*", " ", re.sub(r"/\*.*?\*/", "", markup, flags=re.S)).strip()
+
+
+# Built once per process; reruns only re-send the finished strings
+PREMIUM_CSS = minify_markup("""
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Marcellus&family=Montserrat:wght@400;500;600&display=swap');
+
+    /* Canvas Setup */
+    .stApp, [data-testid="stAppViewContainer"], [data-testid="stSidebar"] {
+        background: radial-gradient(circle at top right, #161A24, #0A0D14) !important;
+        color: #E2E8F0 !important;
+        font-family: 'Montserrat', sans-serif;
+    }
+    
+    h1, h2, h3, h4 {
+        font-family: 'Marcellus', serif !important;
+        color: #F8FAFC !important;
+        font-weight: 400 !important;
+    }
+
+    /* Input Controls */
+    div[data-baseweb="select"] > div {
+        border: 1px solid #2C323F !important;
+        border-radius: 8px !important;
+        background-color: #121620 !important;
+    }
+    div[data-baseweb="select"] span, div[data-baseweb="select"] div {
+        color: #E2E8F0 !important;
+    }
+    [data-testid="stWidgetLabel"] p {
+        color: #94A3B8 !important;
+        font-size: 13px !important;
+        font-weight: 500 !important;
+    }
+
+    /* Buttons */
+    .stButton>button {
+        background: transparent !important;
+        color: #C5A059 !important;
+        border: 1px solid #C5A059 !important;
+        border-radius: 4px !important;
+        padding: 8px 20px !important;
+        font-size: 12px !important;
+        font-weight: 600 !important;
+        text-transform: uppercase;
+        letter-spacing: 0.1em;
+        transition: all 0.3s ease !important;
+    }
+    .stButton>button:hover {
+        transform: translateY(-1px) !important;
+        background: #C5A059 !important;
+        color: #0A0D14 !important;
+        box-shadow: 0 4px 15px rgba(197, 160, 89, 0.2) !important;
+    }
+    
+    .stSlider [role="slider"] { background-color: #C5A059 !important; }
+    [data-testid="stExpander"] {
+        background-color: #121620 !important;
+        border: 1px solid #2C323F !important;
+        border-radius: 8px !important;
+    }
+    
+    /* Interactive Atelier Tabs */
+    button[data-baseweb="tab"] {
+        color: #64748B !important;
+        font-family: 'Marcellus', serif !important;
+        font-size: 16px !important;
+        letter-spacing: 0.05em;
+    }
+    button[aria-selected="true"] {
+        color: #C5A059 !important;
+        border-bottom-color: #C5A059 !important;
+    }
+</style>
+""")
+
+HERO_MARKUP = minify_markup("""
+<div style="text-align: center; margin-top: 20px; margin-bottom: 35px;">
+    <div style="display: inline-block; width: 70px; height: 70px; border-radius: 50%; background: linear-gradient(135deg, #C5A059, #8D6E31); padding: 1px; margin-bottom: 10px;">
+        <div style="width: 100%; height: 100%; border-radius: 50%; background: #0A0D14; display: flex; align-items: center; justify-content: center; font-size: 28px;">🌿</div>
+    </div>
+    <h1 style="font-size: 2.6rem; margin: 0; letter-spacing: 0.05em; color: #FFFFFF;">RAFIYA HENNA ART</h1>
+    <p style="color: #C5A059; font-weight: 500; font-size: 11px; letter-spacing: 0.35em; text-transform: uppercase; margin-top: 4px; margin-bottom: 0;">Atelier & Design Studio</p>
+</div>
+""")
+
+STUDIO_NOTE_MARKUP = minify_markup("""
+<div style='background: rgba(148,163,184,0.04); border-radius: 8px; padding: 12px 16px; margin-top: 20px; border: 1px dashed rgba(255,255,255,0.08);'>
+    <p style='margin:0; font-size:11.5px; color:#64748B; line-height:1.4;'>
+        ⚠️ <b>Studio Note:</b> Automated details may contain minor variance and are optimized to provide immediate clarity when the artist is away. Please confirm pricing and active slot scheduling directly via personal text link.
+    </p>
+</div>
+""")
+
+
+def card_key(item: Dict) -> Tuple:
+    return tuple(item.get(field) for field in ("name", "type", "length", "hand", "side", "price", "description"))
+
+
+@lru_cache(maxsize=4096)
+def card_markup(key: Tuple) -> str:
+    """Card HTML depends only on package content (``card_key``), so it is rendered once per distinct package per process."""
+    name, pkg_type, length, hand, side, price, description = key
+    is_bridal = "bridal" in (pkg_type or "").lower()
+    if is_bridal:
+        card_style = """
+            border: 1px solid #C5A059; 
+            background: linear-gradient(135deg, #181C26, #0A0D14);
+            box-shadow: 0 10px 30px rgba(197, 160, 89, 0.08);
+        """
+        badge_style = "background: rgba(197, 160, 89, 0.15); color: #C5A059; border: 1px solid rgba(197, 160, 89, 0.3);"
+        title_color = "#F1E7D0"
+    else:
+        card_style = """
+            border: 1px solid #2C323F; 
+            background: #121620;
+            box-shadow: 0 10px 25px rgba(0,0,0,0.4);
+        """
+        badge_style = "background: rgba(148, 163, 184, 0.1); color: #94A3B8;"
+        title_color = "#FFFFFF"
+
+    return f"""
+    <div style="border-radius: 12px; padding: 22px; display: flex; flex-direction: column; 
+         justify-content: space-between; height: 340px; margin-bottom: 12px; {card_style}">
+        <div>
+            <span style="font-size: 9px; font-weight: 600; padding: 4px 10px; border-radius: 4px; text-transform: uppercase; letter-spacing: 0.05em; {badge_style}">
+                {pkg_type}
+            </span>
+            <h3 style="margin-top: 16px; margin-bottom: 4px; font-size: 18px; line-height: 1.3; color: {title_color};">{name}</h3>
+            <div style="font-size:11px; color: #64748B; margin-bottom: 12px;">📐 {length} • ✋ {hand}</div>
+            <p style="color: #94A3B8; font-size: 13px; overflow-y: auto; max-height: 95px; line-height: 1.5;">
+                {description}
+            </p>
+        </div>
+        <div style="border-top: 1px solid rgba(255,255,255,0.05); padding-top: 12px; font-family: 'Marcellus', serif; font-size: 16px; color: #C5A059;">
+            {price} BDT
+        </div>
+    </div>
+    """
+
+
+@lru_cache(maxsize=8192)
+def faq_answer_markup(answer: str) -> str:
+    return (
+        '<div style="background-color: #0A0D14; padding: 18px; border-left: 2px solid #C5A059; '
+        f'border-radius: 4px; color: #94A3B8; font-size: 14px; line-height: 1.7;">{answer}</div>'
+    )
@@ -0,0 +1,232 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+_NAME_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _metric_name(prefix: str, name: str) -> str:
+    return _NAME_RE.sub("_", f"{prefix}_{name}" if prefix else name)
+
+
+# ---------------------------
+# Sliding-Window Histogram
+# ---------------------------
+class Histogram:
+    """Count and sum over the process lifetime; quantiles over the most recent ``window`` samples."""
+
+    def __init__(self, window: int = 2048):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantiles(self) -> Dict[float, float]:
+        if not self.samples:
+            return {q: 0.0 for q in QUANTILES}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {q: round(ordered[min(last, int(q * len(ordered)))], 3) for q in QUANTILES}
+
+    def summary(self) -> Dict[str, float]:
+        p50, p95, p99 = (self.quantiles()[q] for q in QUANTILES)
+        return {"count": self.count, "sum": round(self.total, 3), "p50": p50, "p95": p95, "p99": p99}
+
+
+# ---------------------------
+# Metrics Registry
+# ---------------------------
+class Metrics:
+    """Process-wide latency histograms, counters and pulled gauges for the chat pipeline.
+
+    ``hook`` matches the ``MetricsHook`` signature used by AgenticAI and PromptContextBuilder: each
+    event is counted and each of its values lands in a ``<event>_<key>`` histogram. Components that
+    already keep their own counters (scheduler, caches) are registered as collectors and read on export.
+    """
+
+    def __init__(self, prefix: str = "studio", window: int = 2048):
+        self.prefix = prefix
+        self.window = window
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.window)
+            histogram.observe(float(value))
+
+    def inc(self, name: str, amount: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Records the block's wall time in milliseconds, also when it exits through an exception (e.g. st.rerun)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000)
+
+    def phases(self, prefix: str) -> "PhaseTimer":
+        return PhaseTimer(self, prefix)
+
+    def hook(self, event: str, values: Dict[str, float]):
+        self.inc(event)
+        for key, value in values.items():
+            self.observe(f"{event}_{key}", value)
+
+    def register(self, name: str, collector: Callable[[], Dict[str, float]]):
+        """Exports ``collector()`` as gauges named ``<name>_<key>``; re-registering a name replaces it."""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def _gauges(self) -> Dict[str, float]:
+        with self._lock:
+            collectors = list(self._collectors.items())
+        gauges: Dict[str, float] = {}
+        for name, collector in collectors:
+            try:
+                values = collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {name} failed: {e}")
+                continue
+            gauges.update({f"{name}_{key}": value for key, value in values.items()})
+        return gauges
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            histograms = {name: h.summary() for name, h in sorted(self._histograms.items())}
+            counters = dict(sorted(self._counters.items()))
+        return {
+            "ts": round(time.time(), 3),
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "histograms": histograms,
+            "counters": counters,
+            "gauges": self._gauges(),
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition: histograms as summaries, counters as ``_total``, collectors as gauges."""
+        snap = self.snapshot()
+        lines: List[str] = []
+        for name, summary in snap["histograms"].items():
+            metric = _metric_name(self.prefix, name)
+            lines.append(f"# TYPE {metric} summary")
+            for q, key in zip(QUANTILES, ("p50", "p95", "p99")):
+                lines.append(f'{metric}{{quantile="{q}"}} {summary[key]}')
+            lines.append(f"{metric}_sum {summary['sum']}")
+            lines.append(f"{metric}_count {summary['count']}")
+        for name, value in snap["counters"].items():
+            metric = _metric_name(self.prefix, f"{name}_total")
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, value in snap["gauges"].items():
+            if isinstance(value, (int, float)):
+                metric = _metric_name(self.prefix, name)
+                lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_jsonl(self, path: str, max_bytes: int = 0):
+        """Appends a snapshot line; past ``max_bytes`` the file is rotated to ``<path>.1`` first (one backup kept)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if max_bytes and os.path.exists(path) and os.path.getsize(path) >= max_bytes:
+            os.replace(path, f"{path}.1")
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(self.snapshot(), ensure_ascii=False) + "\n")
+
+
+class PhaseTimer:
+    """Splits one run into consecutive phases: ``mark(name)`` records the time since the previous mark as ``<prefix>_<name>_ms``."""
+
+    def __init__(self, metrics: Metrics, prefix: str):
+        self.metrics = metrics
+        self.prefix = prefix
+        self._last = time.perf_counter()
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.metrics.observe(f"{self.prefix}_{phase}_ms", (now - self._last) * 1000)
+        self._last = now
+
+
+# ---------------------------
+# Exporters
+# ---------------------------
+def serve_prometheus(metrics: Metrics, port: int, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """Serves ``/metrics`` (Prometheus text) and ``/metrics.json`` from a daemon thread; None if the port is taken."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics.json"):
+                body, content_type = json.dumps(metrics.snapshot()).encode(), "application/json"
+            elif self.path.startswith("/metrics"):
+                body, content_type = metrics.to_prometheus().encode(), "text/plain; version=0.0.4"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        # Several app processes on one host: the first one to bind serves, the others only log to JSON lines
+        logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return server
+
+
+class JsonLinesExporter:
+    """Appends a metrics snapshot to ``path`` every ``interval`` seconds from a daemon thread,
+    rotating the file once it reaches ``max_bytes`` so disk use stays under twice that."""
+
+    def __init__(self, metrics: Metrics, path: str, interval: float = 60.0, max_bytes: int = 10 * 1024 * 1024):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-jsonl", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        try:
+            self.metrics.write_jsonl(self.path, self.max_bytes)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.path}: {e}")
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,113 @@
+import json
+import logging
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional
+
+from faq_index import NgramBM25
+from language import LANGUAGE_NAMES
+from query_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+MetricsHook = Callable[[str, Dict[str, float]], None]
+
+PERSONA = (
+    "You are Rafiya, a friendly henna artist 🌿✨. "
+    "Respond naturally, matching the user's tone. "
+    "Reply instantly in whatever language the query uses (Bangla, English, or Banglish).\n\n"
+    "CRITICAL: Keep your response short, precise, and directly to the point. No fluff or lengthy introductions. "
+    "Dynamically provide accurate summaries using this data context:\n"
+    "1️⃣ FAQ details.\n"
+    "2️⃣ Bridal/Non-Bridal Packages: Show quick rates & link to 🌿 [Packages](https://rafiyashennaart.streamlit.app/Packages)\n"
+    "3️⃣ Products: List availability & link to 🌿 [Products](https://sites.google.com/view/rafiyashennaart/products)\n"
+    "4️⃣ Training: Provide details & link to 🌿 [Courses](https://sites.google.com/view/rafiyashennaart/courses-training)\n\n"
+    "Always drop short links to secure direct bookings or questions:\n"
+    "💬 [Messenger](https://m.me/Rafiya.HennaArt) | 📱 [WhatsApp](https://wa.me/8801323278403)\n\n"
+    "If information isn't available in context, provide the closest alternative and guide them to message directly."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); good enough for before/after comparisons offline."""
+    return max(1, round(len(text) / 4)) if text else 0
+
+
+def compact_json(data: Any) -> str:
+    """Canonical, whitespace-free serialization so identical data always yields the identical context."""
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=_plain)
+
+
+def _plain(value: Any) -> Any:
+    # Secrets hand back nested AttrDict mappings, which json cannot serialize directly
+    return dict(value) if isinstance(value, Mapping) else str(value)
+
+
+def package_line(pkg: Dict) -> str:
+    return f"{pkg.get('name')} | {pkg.get('type')} | {pkg.get('length')} | {pkg.get('hand')} | {pkg.get('side')} | {pkg.get('price')} BDT"
+
+
+# ---------------------------
+# Compact Prompt Context
+# ---------------------------
+class PromptContextBuilder:
+    """Serializes studio data once into a system instruction and retrieves top-k snippets per turn.
+
+    Snippets are ranked on ``normalize_query`` text like every other tier. ``faq_index`` may be an
+    index already built over each FAQ's normalized question and answer, in ``faq_list`` order
+    (``LocalRetriever.index``), so a snapshot does not index the same text twice.
+    """
+
+    def __init__(self, faq_list: List[Dict], personal: Dict, top_k: int = 3, metrics_hook: Optional[MetricsHook] = None,
+                 faq_index: Optional[NgramBM25] = None):
+        self.faq_list = faq_list
+        self.personal = personal
+        self.packages: List[Dict] = list(personal.get("packages", []))
+        self.top_k = top_k
+        self.metrics_hook = metrics_hook
+
+        profile = {k: v for k, v in personal.items() if k != "packages"}
+        catalog = "\n".join(package_line(p) for p in self.packages)
+        self.system_instruction = (
+            f"{PERSONA}\n\n"
+            f"Studio profile: {compact_json(profile)}\n"
+            f"Package catalog (name | type | length | hand | side | price):\n{catalog}"
+        )
+        self.faq_snippets = [f"Q: {f['question']} A: {f['answer']}" for f in faq_list]
+        self.package_snippets = [f"Package: {package_line(p)}. {p.get('description', '')}" for p in self.packages]
+        self.faq_index = faq_index if faq_index is not None else NgramBM25(
+            [normalize_query(f"{f['question']} {f['answer']}") for f in faq_list]
+        )
+        self.package_index = NgramBM25([normalize_query(s) for s in self.package_snippets])
+
+        # Size of the prompt the old full-context f-string sent on every turn, minus the user input
+        self.legacy_overhead_tokens = estimate_tokens(
+            f"FAQ Context: {faq_list}\nPersonal Context: {personal}\nUser Input: \n\n{PERSONA}"
+        )
+        self.system_tokens = estimate_tokens(self.system_instruction)
+
+    def snippets(self, user_input: str) -> List[str]:
+        cleaned = normalize_query(user_input)
+        found = [self.faq_snippets[i] for i, _ in self.faq_index.rank(cleaned, self.top_k)]
+        found += [self.package_snippets[i] for i, _ in self.package_index.rank(cleaned, self.top_k)]
+        return found
+
+    def build_turn(self, user_input: str, language: Optional[str] = None) -> str:
+        """Per-turn message: only the locally retrieved snippets plus the user's words."""
+        notes = "\n".join(f"- {s}" for s in self.snippets(user_input))
+        prompt = f"Relevant studio notes:\n{notes}\n\nUser Input: {user_input}" if notes else f"User Input: {user_input}"
+        if language:
+            prompt += f"\nReply language: {LANGUAGE_NAMES.get(language, language)}"
+        self.report(user_input, prompt)
+        return prompt
+
+    def report(self, user_input: str, prompt: str):
+        values = {
+            "legacy_prompt_tokens": self.legacy_overhead_tokens + estimate_tokens(user_input),
+            "turn_tokens": estimate_tokens(prompt),
+            "turn_chars": len(prompt),
+            "system_tokens": self.system_tokens,
+        }
+        if self.metrics_hook is not None:
+            self.metrics_hook("prompt_tokens", values)
+        else:
+            logger.debug(f"Prompt tokens: {values}")
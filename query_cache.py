@@ -0,0 +1,107 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Hashable
+
+from cachetools import TTLCache
+
+# ---------------------------
+# Query Normalization
+# ---------------------------
+_BENGALI_DIGITS = str.maketrans("০১২৩৪৫৬৭৮৯", "0123456789")
+_REPEATS_RE = re.compile(r"([a-z])\1{2,}")
+_SPACE_RE = re.compile(r"\s+")
+
+# Common Banglish spellings folded onto one form so paraphrases share a cache slot
+BANGLISH_VARIANTS = {
+    "kto": "koto", "tk": "taka",
+    "ase": "ache", "ace": "ache", "achhe": "ache",
+    "nai": "nei",
+    "kmn": "kemon", "kemne": "kivabe", "kibhabe": "kivabe",
+    "bhai": "vai", "vaia": "vai", "bhaiya": "vai",
+    "plz": "please", "pls": "please",
+    "dhonnobad": "dhonyobad", "thx": "thanks",
+}
+
+
+def normalize_query(text: str) -> str:
+    """Canonical cache key: NFC, casefolded, punctuation/emoji stripped, Bangla digits and Banglish spellings unified."""
+    text = unicodedata.normalize("NFC", text).casefold().translate(_BENGALI_DIGITS)
+    # Category test instead of \\W so Bengali vowel signs (Mn/Mc) survive
+    text = "".join(" " if unicodedata.category(ch)[0] in "PS" else ch for ch in text)
+    text = _REPEATS_RE.sub(r"\1", text)
+    words = [BANGLISH_VARIANTS.get(word, word) for word in _SPACE_RE.split(text) if word]
+    return " ".join(words)
+
+
+def content_fingerprint(data: Any) -> str:
+    """Stable hash of secrets-derived data, used to invalidate caches when the content changes."""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ---------------------------
+# Bounded Shared Answer Cache
+# ---------------------------
+MISSING = object()
+
+
+class _CountingTTLCache(TTLCache):
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float]):
+        super().__init__(maxsize=maxsize, ttl=ttl, timer=timer)
+        self.evictions = 0
+        self.expirations = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+
+class AnswerCache:
+    """Thread-safe LRU + TTL cache shared across Streamlit sessions; negative results are stored as values too."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 6 * 3600, timer: Callable[[], float] = time.monotonic):
+        self._lock = threading.Lock()
+        self._store = _CountingTTLCache(maxsize, ttl, timer)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the cached value or MISSING."""
+        with self._lock:
+            value = self._store.get(key, MISSING)
+            if value is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._store[key] = value
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._store),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self._store.evictions,
+                "expirations": self._store.expirations,
+            }
@@ -0,0 +1,259 @@
+import atexit
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from query_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------
+# MinHash Signatures
+# ---------------------------
+_PRIME = (1 << 61) - 1
+_DIGITS_RE = re.compile(r"\d+")
+_NEGATIONS = frozenset({"no", "non", "not", "without", "na", "nei", "না", "নেই", "ছাড়া"})
+
+
+def shingles(text: str, n: int = 3) -> Set[str]:
+    """Character n-gram shingles of an already normalized query."""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def guard_tokens(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Numbers and negations in a query; near-duplicates must agree on these exactly."""
+    words = set(re.split(r"[\s-]+", text))
+    return tuple(_DIGITS_RE.findall(text)), tuple(sorted(words & _NEGATIONS))
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """Deterministic MinHash over crc32 shingle hashes; seeds are fixed so persisted entries re-index identically."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1337):
+        state = seed
+        self.params: List[Tuple[int, int]] = []
+        for _ in range(num_perm):
+            # Small LCG keeps parameter generation independent of the random module's global state
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = (state >> 3) % _PRIME or 1
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            b = (state >> 3) % _PRIME
+            self.params.append((a, b))
+
+    def signature(self, grams: Set[str]) -> Tuple[int, ...]:
+        hashes = [zlib.crc32(g.encode("utf-8")) for g in grams]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self.params)
+
+
+class _Entry(NamedTuple):
+    answer: str
+    created: float
+    grams: frozenset
+    signature: Tuple[int, ...]
+
+
+# ---------------------------
+# Semantic Response Cache
+# ---------------------------
+class ResponseCache:
+    """Exact + near-duplicate (MinHash/LSH) cache of LLM replies, partitioned by language and persisted to disk.
+
+    Replies quote studio prices and policies, so the cache is tied to one content ``version``
+    (the studio data fingerprint): ``ensure_version`` drops every entry when it changes, and a
+    persisted file written for another version is discarded.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        similarity: float = 0.8,
+        maxsize: int = 2000,
+        ttl: float = 7 * 24 * 3600,
+        num_perm: int = 64,
+        bands: int = 16,
+        flush_interval: float = 30.0,
+        timer: Callable[[], float] = time.time,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.path = path
+        self.similarity = similarity
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.flush_interval = flush_interval
+        self.timer = timer
+        self.hasher = MinHasher(num_perm)
+        self.version: Optional[str] = None
+
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[Tuple[str, str]]] = defaultdict(set)
+        self._dirty = False
+        self._last_flush = 0.0
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    def _bands(self, lang: str, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield lang, band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def _remove(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key)
+        for bucket_key in self._bands(key[0], entry.signature):
+            bucket = self._buckets.get(bucket_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[bucket_key]
+
+    def _insert(self, key: Tuple[str, str], answer: str, created: float):
+        if key in self._entries:
+            self._remove(key)
+        grams = frozenset(shingles(key[1]))
+        entry = _Entry(answer, created, grams, self.hasher.signature(grams))
+        self._entries[key] = entry
+        for bucket_key in self._bands(key[0], entry.signature):
+            self._buckets[bucket_key].add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return now - entry.created > self.ttl
+
+    def ensure_version(self, version: str) -> bool:
+        """Clears the cache if its replies were written for other studio content; True when it did."""
+        with self._lock:
+            if version == self.version:
+                return False
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._buckets.clear()
+            self.version = version
+            self._dirty = True
+            self.invalidations += 1
+        if dropped:
+            logger.info(f"Studio content changed: dropped {dropped} cached responses.")
+        self.save()
+        return True
+
+    def lookup(self, query: str, lang: str) -> Optional[str]:
+        """Returns a stored reply for this query or a sufficiently similar one in the same language."""
+        normalized = normalize_query(query)
+        key = (lang, normalized)
+        now = self.timer()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry, now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.answer
+
+            grams = shingles(normalized)
+            signature = self.hasher.signature(grams)
+            guards = guard_tokens(normalized)
+            best_key, best_sim = None, self.similarity
+            candidates = set()
+            for bucket_key in self._bands(lang, signature):
+                candidates |= self._buckets.get(bucket_key, set())
+            for candidate in candidates:
+                stored = self._entries[candidate]
+                # "2 hands" is not a paraphrase of "3 hands", nor "non bridal" of "bridal"
+                if self._expired(stored, now) or guard_tokens(candidate[1]) != guards:
+                    continue
+                sim = jaccard(grams, stored.grams)
+                if sim >= best_sim:
+                    best_key, best_sim = candidate, sim
+
+            if best_key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.near_hits += 1
+            return self._entries[best_key].answer
+
+    def store(self, query: str, lang: str, answer: str):
+        with self._lock:
+            self._insert((lang, normalize_query(query)), answer, self.timer())
+            self._dirty = True
+            due = self.timer() - self._last_flush >= self.flush_interval
+        if due:
+            self.save()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable response cache {self.path}: {e}")
+            return
+        # Files from before versioning are a bare row list; their version is unknown, so the first ensure_version drops them
+        version, rows = (data.get("version"), data.get("rows", [])) if isinstance(data, dict) else (None, data)
+        now = self.timer()
+        with self._lock:
+            self.version = version
+            for lang, normalized, answer, created in rows:
+                if now - created <= self.ttl:
+                    self._insert((lang, normalized), answer, created)
+        logger.info(f"Loaded {len(self._entries)} cached responses from {self.path}.")
+
+    def save(self):
+        """Atomically writes live entries to disk (temp file + rename) if anything changed."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": self.version,
+                "rows": [[lang, normalized, e.answer, e.created] for (lang, normalized), e in self._entries.items()],
+            }
+            self._dirty = False
+            self._last_flush = self.timer()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist response cache to {self.path}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,191 @@
+from collections.abc import Mapping
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from catalog import CatalogIndex
+from faq_index import FAQIndex, NgramBM25, char_ngrams
+from query_cache import MISSING, AnswerCache, normalize_query
+
+PACKAGES_LINK = "🌿 [Packages](https://rafiyashennaart.streamlit.app/Packages)"
+CONTACT_LINKS = "💬 [Messenger](https://m.me/Rafiya.HennaArt) | 📱 [WhatsApp](https://wa.me/8801323278403)"
+
+# Normalized (see normalize_query) words that signal a price question, in English, Banglish and Bangla
+PRICE_WORDS = frozenset({
+    "price", "prices", "pricing", "cost", "costs", "rate", "rates", "charge", "charges", "fee", "fees",
+    "much", "budget", "cheap", "cheapest", "koto", "taka", "dam", "daam", "দাম", "কত", "টাকা",
+})
+# Price words also appear in duration questions ("how much time") and in fees that are not package
+# prices (travel charge, booking deposit, course fee); those go to the LLM
+NOT_PACKAGE_PRICE_WORDS = frozenset({
+    "time", "long", "last", "lasts", "hour", "hours", "day", "days", "minute", "minutes", "somoy",
+    "travel", "transport", "delivery", "home", "service", "deposit", "advance", "course", "training", "class",
+})
+# Words that carry no subject of their own; a local answer must account for every other word, so a
+# second question in the same message ("is it safe in pregnancy? price?") goes to the LLM instead
+FILLER_WORDS = frozenset({
+    "a", "an", "the", "is", "are", "be", "of", "for", "to", "in", "on", "at", "with", "and", "or", "it",
+    "this", "that", "i", "me", "my", "we", "you", "your", "what", "whats", "s", "how", "which", "where",
+    "please", "pls", "plz", "tell", "give", "show", "know", "can", "could", "would", "do", "does", "about",
+    "any", "there", "number", "details", "info", "henna", "mehndi", "mehedi", "mehendi", "package",
+    "packages", "design", "designs", "ki", "er", "jonno", "lagbe", "ache", "bolen", "bolun", "apnar",
+    "amar", "apu", "vai", "ta", "ti", "hobe", "ar", "o", "আপনার", "কি",
+})
+# Extra query words that point at a profile field whose key contains the dict key
+FIELD_ALIASES = {
+    "phone": {"contact", "mobile", "whatsapp", "নম্বর"},
+    "address": {"location", "located", "ঠিকানা"},
+    "email": {"mail", "gmail"},
+    "hours": {"open", "timing", "timings", "closed"},
+}
+
+
+class LocalAnswer(NamedTuple):
+    kind: str
+    text: str
+    confidence: float
+
+
+def _flatten(profile: Mapping, prefix: str = "") -> List[Tuple[str, str]]:
+    fields = []
+    for key, value in profile.items():
+        label = f"{prefix} {key}".strip()
+        if isinstance(value, Mapping):
+            fields += _flatten(value, label)
+        elif isinstance(value, (list, tuple)):
+            fields.append((label, ", ".join(map(str, value))))
+        elif value not in (None, ""):
+            fields.append((label, str(value)))
+    return fields
+
+
+# ---------------------------
+# Local Answering Tier
+# ---------------------------
+class LocalRetriever:
+    """Answers mid-confidence queries from studio data without calling Gemini.
+
+    Sits between the FAQ match and the LLM and tries, in order: an FAQ entry just below the direct
+    match threshold that covers most of the query (n-gram BM25 over FAQ questions and answers), a
+    price table for packages named in the query or matching its facet values, and profile fields
+    named in the query. Price and profile answers are only given when every other word of the query
+    is filler, so mixed or unrelated questions are not half-answered. Anything below
+    ``min_confidence`` returns None and goes to the LLM.
+    """
+
+    def __init__(self, faqs: List[Dict], packages: List[Dict], profile: Mapping,
+                 catalog: Optional[CatalogIndex] = None, faq_index: Optional[FAQIndex] = None,
+                 faq_floor: float = 0.5, min_coverage: float = 0.7, min_confidence: float = 0.5,
+                 cache_size: int = 4096, cache_ttl: float = 6 * 3600):
+        self.catalog = catalog if catalog is not None else CatalogIndex(list(packages))
+        self.faq_index = faq_index if faq_index is not None else FAQIndex(list(faqs))
+        self.faq_floor = faq_floor
+        self.min_coverage = min_coverage
+        self.min_confidence = min_confidence
+        self.fields = _flatten({k: v for k, v in profile.items() if k != "packages"})
+
+        self.index = NgramBM25([normalize_query(f"{faq['question']} {faq['answer']}") for faq in faqs])
+        self.doc_grams = [frozenset(char_ngrams(t)) for t in self.index.texts]
+        self._faq_ids = {faq['question']: i for i, faq in enumerate(faqs)}
+        self._max_idf = max(self.index.idf.values(), default=1.0)
+
+        self.name_words = {pkg['name']: frozenset(normalize_query(pkg['name']).split()) for pkg in packages}
+        # Single generic words ("one", "both", "front") only count as facet values for type and length
+        self.facet_values: List[Tuple[str, str, str, int]] = [
+            (facet, value, normalize_query(str(value)), bits)
+            for facet, entries in self.catalog.facets.items()
+            for value, bits in entries
+            if value is not None and (facet in ("type", "length") or " " in normalize_query(str(value)))
+        ]
+        self.field_words = [
+            (label, value, set(label.lower().replace("_", " ").split()).union(*(
+                aliases for key, aliases in FIELD_ALIASES.items() if key in label.lower())))
+            for label, value in self.fields
+        ]
+        self.cache = AnswerCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def coverage(self, query: str, doc_id: int) -> float:
+        """IDF-weighted share of the query's n-grams found in a passage (0..1); unseen n-grams weigh the most."""
+        grams = set(char_ngrams(query))
+        total = sum(self.index.idf.get(g, self._max_idf) for g in grams)
+        found = sum(self.index.idf[g] for g in grams if g in self.doc_grams[doc_id])
+        return found / total if total else 0.0
+
+    def answer(self, user_input: str) -> Optional[LocalAnswer]:
+        key = normalize_query(user_input)
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return cached
+        words = set(key.split())
+        result = (
+            self._faq_answer(key)
+            or self._price_answer(key, words)
+            or self._profile_answer(words)
+        )
+        if result is not None and result.confidence < self.min_confidence:
+            result = None
+        self.cache.set(key, result)
+        return result
+
+    # Price lookups by package name or facet value
+    def _price_answer(self, key: str, words: set) -> Optional[LocalAnswer]:
+        if not words & PRICE_WORDS or words & NOT_PACKAGE_PRICE_WORDS:
+            return None
+        rest = words - PRICE_WORDS - FILLER_WORDS
+        named = [name for name, name_words in self.name_words.items() if name_words and name_words <= words]
+        if named:
+            if rest - set().union(*(self.name_words[name] for name in named)):
+                return None
+            return self._price_table(self.catalog.by_names(named), "Package price", 0.9)
+
+        bits, matched = self.catalog.all_bits, []
+        padded = f" {key} "
+        for facet in ("type", "length", "hand", "side"):
+            hits = [(value, norm, vbits) for f, value, norm, vbits in self.facet_values if f == facet and f" {norm} " in padded]
+            # "non bridal" also contains "bridal": keep only the most specific values
+            hits = [h for h in hits if not any(h[1] != o[1] and f" {h[1]} " in f" {o[1]} " for o in hits)]
+            if hits:
+                facet_bits = 0
+                for _, _, vbits in hits:
+                    facet_bits |= vbits
+                bits &= facet_bits
+                matched += [str(value) for value, _, _ in hits]
+                rest -= set().union(*(norm.split() for _, norm, _ in hits))
+        # Combinations the studio does not offer, or anything else asked alongside, go to the LLM
+        if not matched or not bits or rest:
+            return None
+        return self._price_table(self._by_price(bits), f"{' · '.join(matched)} packages", 0.8)
+
+    def _by_price(self, bits: int) -> List[Dict]:
+        # Internal ids are assigned in price order, so sorting ids sorts by price
+        return [self.catalog.packages[i] for i in sorted(self.catalog.ids(bits))]
+
+    def _price_table(self, packages: List[Dict], heading: str, confidence: float, limit: int = 5) -> Optional[LocalAnswer]:
+        if not packages:
+            return None
+        prices = [p['price'] for p in packages]
+        span = f"{min(prices)} BDT" if min(prices) == max(prices) else f"{min(prices)}–{max(prices)} BDT"
+        lines = [
+            f"- **{p['name']}** ({p.get('type')} · {p.get('length')} · {p.get('hand')}, {p.get('side')}): **{p['price']} BDT**"
+            for p in packages[:limit]
+        ]
+        if len(packages) > limit:
+            lines.append(f"- …and {len(packages) - limit} more")
+        text = f"💰 **{heading}:** {span}\n\n" + "\n".join(lines) + f"\n\n{PACKAGES_LINK} • Book: {CONTACT_LINKS}"
+        return LocalAnswer("price", text, confidence)
+
+    # Contact and profile facts
+    def _profile_answer(self, words: set) -> Optional[LocalAnswer]:
+        hits = [(label, value, field_words) for label, value, field_words in self.field_words if field_words & words]
+        if not hits or words - FILLER_WORDS - set().union(*(field_words for _, _, field_words in hits)):
+            return None
+        lines = [f"📇 **{label.replace('_', ' ').title()}:** {value}" for label, value, _ in hits[:3]]
+        return LocalAnswer("profile", "\n\n".join(lines) + f"\n\n{CONTACT_LINKS}", 0.85)
+
+    # FAQ entries just below the direct-match threshold
+    def _faq_answer(self, key: str) -> Optional[LocalAnswer]:
+        question, answer, similarity = self.faq_index.best_match(key, self.faq_floor)
+        if question is None:
+            return None
+        cover = self.coverage(key, self._faq_ids[question])
+        if cover < self.min_coverage:
+            return None
+        return LocalAnswer("faq", f"🔍 **Closest studio note:** *{question}*\n\n{answer}", round(similarity * cover, 3))
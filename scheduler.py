@@ -0,0 +1,211 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, stop_after_delay, wait_random_exponential
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request cannot start or finish within its deadline."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """google.api_core errors carry the HTTP status in ``.code``; quota (429) and 5xx responses are worth retrying."""
+    return getattr(exc, "code", None) in RETRYABLE_CODES or isinstance(exc, ConnectionError)
+
+
+# ---------------------------
+# Token Bucket Rate Limiter
+# ---------------------------
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, burst: int, timer: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.timer = timer
+        self.sleep = sleep
+        self.updated = timer()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token (possibly going negative) and returns how long the caller must wait for it."""
+        with self._lock:
+            now = self.timer()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self, deadline: float):
+        wait = self._reserve()
+        if wait and self.timer() + wait > deadline:
+            with self._lock:
+                self.tokens += 1
+            raise DeadlineExceeded("Rate limit wait would exceed the request deadline")
+        if wait:
+            self.sleep(wait)
+
+
+# ---------------------------
+# Shared In-Flight Streams
+# ---------------------------
+class _SharedStream:
+    """Broadcasts one upstream stream's chunks to every caller that asked the same prompt meanwhile."""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+
+    def publish(self, chunk: str):
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None):
+        if error is not None and not isinstance(error, Exception):
+            # The leader was cancelled (e.g. its generator closed); followers get a plain error instead
+            error = RuntimeError("Shared request was abandoned before it finished")
+        with self._cond:
+            self.done = True
+            self.error = error
+            self._cond.notify_all()
+
+    def follow(self, deadline: float, timer: Callable[[], float]) -> Iterator[str]:
+        seen = 0
+        while True:
+            with self._cond:
+                while seen == len(self.chunks) and not self.done:
+                    remaining = deadline - timer()
+                    if remaining <= 0 or not self._cond.wait(timeout=remaining):
+                        raise DeadlineExceeded("Timed out waiting for a shared in-flight request")
+                pending = self.chunks[seen:]
+                finished, error = self.done, self.error
+            seen += len(pending)
+            yield from pending
+            if finished and seen == len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
+
+# ---------------------------
+# Request Scheduler
+# ---------------------------
+class RequestScheduler:
+    """Gates upstream LLM calls: global in-flight cap, token-bucket rate limit, per-request deadline,
+    jittered exponential backoff on 429/5xx, and coalescing of identical in-flight prompts.
+
+    Calls run on the caller's thread (Streamlit already gives each session its own script thread);
+    the scheduler only decides when they may start and how failures are retried.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 4,
+        requests_per_minute: float = 15,
+        burst: Optional[int] = None,
+        deadline: float = 30.0,
+        max_attempts: int = 4,
+        backoff_initial: float = 1.0,
+        backoff_max: float = 16.0,
+        timer: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.timer = timer
+        self.sleep = sleep
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst or max_in_flight, timer=timer, sleep=sleep)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, _SharedStream] = {}
+        self.counters: Dict[str, int] = {"requests": 0, "coalesced": 0, "retries": 0, "errors": 0, "deadline_exceeded": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def stream(self, key: str, call: Callable[[float], Iterable[str]], deadline: Optional[float] = None) -> Iterator[str]:
+        """Runs ``call(timeout)`` under the scheduler's limits and yields its chunks.
+
+        Callers passing the same ``key`` while a request is in flight share its output instead of
+        issuing their own upstream call.
+        """
+        expires = self.timer() + (deadline or self.deadline)
+        with self._lock:
+            shared = self._in_flight.get(key)
+            leader = shared is None
+            if leader:
+                shared = self._in_flight[key] = _SharedStream()
+            self.counters["requests" if leader else "coalesced"] += 1
+
+        if not leader:
+            yield from shared.follow(expires, self.timer)
+            return
+
+        error: Optional[BaseException] = None
+        try:
+            for chunk in self._execute(call, expires):
+                shared.publish(chunk)
+                yield chunk
+        except BaseException as e:
+            error = e
+            if isinstance(e, DeadlineExceeded):
+                self._count("deadline_exceeded")
+            elif isinstance(e, Exception):
+                self._count("errors")
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            shared.finish(error)
+
+    def _execute(self, call: Callable[[float], Iterable[str]], expires: float) -> Iterator[str]:
+        def log_retry(retry_state):
+            self._count("retries")
+            logger.warning(f"Retrying LLM request after {retry_state.outcome.exception()!r} (attempt {retry_state.attempt_number}).")
+
+        retrying = Retrying(
+            retry=retry_if_exception(is_retryable),
+            wait=wait_random_exponential(multiplier=self.backoff_initial, max=self.backoff_max),
+            stop=stop_after_attempt(self.max_attempts) | stop_after_delay(max(0.0, expires - self.timer())),
+            sleep=self.sleep,
+            before_sleep=log_retry,
+            reraise=True,
+        )
+        # Retries only cover the request up to its first chunk; once text has been shown it cannot be replayed
+        for attempt in retrying:
+            with attempt:
+                self.bucket.acquire(expires)
+                if not self._slots.acquire(timeout=max(0.0, expires - self.timer())):
+                    raise DeadlineExceeded("No free request slot before the deadline")
+                try:
+                    chunks = iter(call(max(0.1, expires - self.timer())))
+                    first = next(chunks, None)
+                except BaseException:
+                    self._slots.release()
+                    raise
+        try:
+            if first is None:
+                return
+            yield first
+            for chunk in chunks:
+                yield chunk
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters, in_flight=len(self._in_flight))
@@ -0,0 +1,249 @@
+import atexit
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from conversation import ConversationMemory
+
+logger = logging.getLogger(__name__)
+
+_SESSION_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+
+def resolve_session_id(candidate: Optional[str]) -> str:
+    """Keeps a well-formed id carried over from the session cookie, otherwise issues a fresh one."""
+    if candidate and _SESSION_ID_RE.fullmatch(candidate):
+        return candidate
+    return uuid.uuid4().hex
+
+
+# ---------------------------
+# Per-Visitor State
+# ---------------------------
+class SessionData:
+    """Everything a visitor keeps between reruns: saved looks and chat memory."""
+
+    __slots__ = ("favorites", "conversation")
+
+    def __init__(self, favorites: Set[str], conversation: ConversationMemory):
+        self.favorites = favorites
+        self.conversation = conversation
+
+    def to_dict(self) -> Dict:
+        return {"favorites": sorted(self.favorites.copy()), "conversation": self.conversation.to_dict()}
+
+    def restore(self, state: Dict):
+        self.favorites = set(state.get("favorites", []))
+        self.conversation.restore(state.get("conversation", {}))
+
+
+# ---------------------------
+# Storage Backends
+# ---------------------------
+class MemoryBackend:
+    """Process-local backend for tests and single-process runs; stores serialized copies like SQLite does."""
+
+    def __init__(self):
+        self._rows: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._rows.get(session_id)
+        return json.loads(row) if row is not None else None
+
+    def save_many(self, states: Dict[str, Dict]):
+        encoded = {sid: json.dumps(state, ensure_ascii=False) for sid, state in states.items()}
+        with self._lock:
+            self._rows.update(encoded)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._rows.pop(session_id, None)
+
+    def purge(self, older_than: float) -> int:
+        return 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class SQLiteBackend:
+    """Shared on-disk backend: WAL mode so several app processes read while one writes, one transaction per batch."""
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, data TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_many(self, states: Dict[str, Dict]):
+        now = time.time()
+        rows = [(sid, json.dumps(state, ensure_ascii=False), now) for sid, state in states.items()]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO sessions (id, data, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET data = excluded.data, updated = excluded.updated",
+                    rows,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def purge(self, older_than: float) -> int:
+        """Deletes sessions last written before ``older_than`` (epoch seconds)."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE updated < ?", (older_than,)).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+# ---------------------------
+# Write-Behind Session Store
+# ---------------------------
+class SessionStore:
+    """Keeps only active sessions in memory, loading the rest lazily from a backend.
+
+    Changes are marked with ``mark_dirty`` and written in batches by a background thread every
+    ``flush_interval`` seconds (and at exit). Sessions idle for ``idle_ttl`` seconds, or beyond
+    ``max_cached`` least recently used ones, are flushed and dropped from memory.
+    """
+
+    def __init__(
+        self,
+        backend,
+        factory: Callable[[], SessionData],
+        flush_interval: float = 2.0,
+        idle_ttl: float = 10 * 60,
+        max_cached: int = 5000,
+        retention_days: float = 90,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.backend = backend
+        self.factory = factory
+        self.flush_interval = flush_interval
+        self.idle_ttl = idle_ttl
+        self.max_cached = max_cached
+        self.timer = timer
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, Tuple[SessionData, float]]" = OrderedDict()
+        self._dirty: Set[str] = set()
+        self.counters: Dict[str, int] = {"loads": 0, "misses": 0, "writes": 0, "flushes": 0, "evictions": 0}
+
+        if retention_days:
+            purged = backend.purge(time.time() - retention_days * 86400)
+            if purged:
+                logger.info(f"Purged {purged} sessions older than {retention_days} days.")
+        self._stop = threading.Event()
+        if flush_interval > 0:
+            threading.Thread(target=self._run, name="session-store-flush", daemon=True).start()
+        atexit.register(self.flush)
+
+    def get(self, session_id: str, refresh: bool = False) -> SessionData:
+        """This session's state; ``refresh`` re-reads the backend unless local changes are still pending."""
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is not None and not (refresh and session_id not in self._dirty):
+                self._cache[session_id] = (entry[0], self.timer())
+                self._cache.move_to_end(session_id)
+                return entry[0]
+
+        state = self.backend.load(session_id)
+        session = self.factory()
+        if state is not None:
+            session.restore(state)
+        with self._lock:
+            self.counters["loads" if state is not None else "misses"] += 1
+            self._cache[session_id] = (session, self.timer())
+            self._cache.move_to_end(session_id)
+            overflow = list(self._cache)[:max(0, len(self._cache) - self.max_cached)]
+        if overflow:
+            self._evict(overflow)
+        return session
+
+    def mark_dirty(self, session_id: str, session: SessionData):
+        """Queues ``session`` for the next batch; re-caches it if it was evicted while the script held it."""
+        with self._lock:
+            self._cache[session_id] = (session, self.timer())
+            self._cache.move_to_end(session_id)
+            self._dirty.add(session_id)
+
+    def flush(self, session_ids: Optional[Iterable[str]] = None) -> int:
+        """Writes pending sessions (all, or just ``session_ids``) in one backend batch."""
+        with self._lock:
+            ids = self._dirty if session_ids is None else self._dirty.intersection(session_ids)
+            pending = {sid: self._cache[sid][0] for sid in ids if sid in self._cache}
+            self._dirty.difference_update(pending)
+        if not pending:
+            return 0
+        states = {sid: session.to_dict() for sid, session in pending.items()}
+        try:
+            self.backend.save_many(states)
+        except Exception as e:
+            logger.error(f"Session flush failed, retrying next cycle: {e}")
+            with self._lock:
+                self._dirty.update(sid for sid in pending if sid in self._cache)
+            return 0
+        with self._lock:
+            self.counters["writes"] += len(states)
+            self.counters["flushes"] += 1
+        return len(states)
+
+    def _evict(self, session_ids: Iterable[str]):
+        session_ids = list(session_ids)
+        self.flush(session_ids)
+        with self._lock:
+            for sid in session_ids:
+                # A session that was written to again meanwhile stays until the next cycle
+                if sid not in self._dirty and self._cache.pop(sid, None) is not None:
+                    self.counters["evictions"] += 1
+
+    def evict_idle(self) -> int:
+        now = self.timer()
+        with self._lock:
+            idle = [sid for sid, (_, used) in self._cache.items() if now - used > self.idle_ttl]
+        if idle:
+            self._evict(idle)
+        return len(idle)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                self.evict_idle()
+            except Exception as e:
+                logger.error(f"Session store maintenance failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters, cached=len(self._cache), dirty=len(self._dirty))
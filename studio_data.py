@@ -0,0 +1,246 @@
+import hashlib
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import toml
+
+from catalog import CatalogIndex
+from faq_index import FAQHandler
+from prompt_context import MetricsHook, PromptContextBuilder
+from query_cache import content_fingerprint
+from retrieval import LocalRetriever
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------
+# Typed Studio Records
+# ---------------------------
+class _RecordAccess:
+    """Mapping-style reads (``rec['name']``, ``rec.get('type')``) so records drop in where secrets dicts were used."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+@dataclass(frozen=True, slots=True)
+class FAQRecord(_RecordAccess):
+    question: str
+    answer: str
+    category: str = "general"
+
+
+@dataclass(frozen=True, slots=True)
+class PackageRecord(_RecordAccess):
+    name: str
+    type: str
+    length: str
+    hand: str
+    side: str
+    price: Union[int, float]
+    description: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class StudioData:
+    """One immutable, fully indexed version of the studio content; swapped as a whole on reload."""
+
+    fingerprint: str
+    api_key: str
+    faqs: Tuple[FAQRecord, ...]
+    packages: Tuple[PackageRecord, ...]
+    profile: Dict[str, Any]
+    faq_by_category: Tuple[Tuple[str, Tuple[FAQRecord, ...]], ...]
+    faq_handler: FAQHandler
+    catalog: CatalogIndex
+    prompt_context: PromptContextBuilder
+    retriever: LocalRetriever
+    issues: Tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def personal(self) -> Dict[str, Any]:
+        return {**self.profile, "packages": list(self.packages)}
+
+
+# ---------------------------
+# Validation
+# ---------------------------
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _price(value: Any) -> Optional[Union[int, float]]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        number = float(str(value).replace(",", "").replace("BDT", "").strip())
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def parse_faqs(rows: Sequence[Any], issues: List[str]) -> Tuple[FAQRecord, ...]:
+    records = []
+    for i, row in enumerate(rows):
+        if not isinstance(row, Mapping):
+            issues.append(f"faq #{i}: not a table, skipped")
+            continue
+        question, answer = _text(row.get("question")), _text(row.get("answer"))
+        if not question or not answer:
+            issues.append(f"faq #{i}: missing question or answer, skipped")
+            continue
+        records.append(FAQRecord(question, answer, _text(row.get("category")) or "general"))
+    return tuple(records)
+
+
+def parse_packages(rows: Sequence[Any], issues: List[str]) -> Tuple[PackageRecord, ...]:
+    records = []
+    for i, row in enumerate(rows):
+        if not isinstance(row, Mapping):
+            issues.append(f"package #{i}: not a table, skipped")
+            continue
+        values = {name: _text(row.get(name)) for name in ("name", "type", "length", "hand", "side")}
+        missing = [name for name, value in values.items() if not value]
+        price = _price(row.get("price"))
+        if missing or price is None:
+            problems = missing + ([] if price is not None else ["price"])
+            issues.append(f"package #{i} ({values['name'] or '?'}): invalid {', '.join(problems)}, skipped")
+            continue
+        records.append(PackageRecord(price=price, description=_text(row.get("description")) or "", **values))
+    return tuple(records)
+
+
+def build_studio_data(secrets: Mapping, metrics_hook: Optional[MetricsHook] = None) -> StudioData:
+    """Validates raw secrets into typed records and builds every derived index once."""
+    faq_rows = (secrets.get("faq") or {}).get("questions", []) or []
+    personal = dict((secrets.get("personal") or {}).get("data", {}) or {})
+    api_key = str((secrets.get("genai") or {}).get("api_key", ""))
+
+    issues: List[str] = []
+    faqs = parse_faqs(list(faq_rows), issues)
+    packages = parse_packages(list(personal.pop("packages", []) or []), issues)
+    profile = {k: dict(v) if isinstance(v, Mapping) else v for k, v in personal.items()}
+    for issue in issues:
+        logger.warning(f"Studio data: {issue}")
+
+    grouped: Dict[str, List[FAQRecord]] = {}
+    for faq in faqs:
+        grouped.setdefault(faq.category, []).append(faq)
+
+    # Records serialize through repr(), so any field change alters the fingerprint
+    fingerprint = content_fingerprint([api_key, faqs, packages, profile])
+    faq_handler = FAQHandler(list(faqs))
+    catalog = CatalogIndex(list(packages))
+    retriever = LocalRetriever(list(faqs), list(packages), profile, catalog=catalog, faq_index=faq_handler.index)
+    return StudioData(
+        fingerprint=fingerprint,
+        api_key=api_key,
+        faqs=faqs,
+        packages=packages,
+        profile=profile,
+        faq_by_category=tuple((cat, tuple(grouped[cat])) for cat in sorted(grouped)),
+        faq_handler=faq_handler,
+        catalog=catalog,
+        # LLM snippets rank FAQs on the local tier's index of the same question + answer text
+        prompt_context=PromptContextBuilder(list(faqs), {**profile, "packages": list(packages)},
+                                            metrics_hook=metrics_hook, faq_index=retriever.index),
+        retriever=retriever,
+        issues=tuple(issues),
+    )
+
+
+# ---------------------------
+# Hot-Reloading Store
+# ---------------------------
+def read_secrets_files(paths: Sequence[str]) -> Dict[str, Any]:
+    """Merges secrets files the way Streamlit does: later files override earlier top-level keys."""
+    merged: Dict[str, Any] = {}
+    for path in paths:
+        if os.path.exists(path):
+            merged.update(toml.load(path))
+    return merged
+
+
+class StudioDataStore:
+    """Serves the current StudioData and rebuilds it in a background thread when the secrets files change.
+
+    Files are polled by mtime; a rebuild only happens when the content hash differs, and the new
+    snapshot replaces the old one in a single reference swap, so readers never see a half-built state.
+    A reload that fails validation keeps serving the previous snapshot.
+    """
+
+    def __init__(self, paths: Sequence[str], poll_interval: float = 5.0,
+                 metrics_hook: Optional[MetricsHook] = None):
+        self.paths = list(paths)
+        self.poll_interval = poll_interval
+        self.metrics_hook = metrics_hook
+        self._content_hash, self._mtimes = self._snapshot()
+        self._data = build_studio_data(read_secrets_files(self.paths), self.metrics_hook)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="studio-data-watcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def data(self) -> StudioData:
+        return self._data
+
+    def _mtimes_now(self) -> Tuple[float, ...]:
+        return tuple(os.stat(p).st_mtime if os.path.exists(p) else -1.0 for p in self.paths)
+
+    def _snapshot(self) -> Tuple[str, Tuple[float, ...]]:
+        digest = hashlib.sha256()
+        for path in self.paths:
+            if os.path.exists(path):
+                with open(path, "rb") as fh:
+                    digest.update(fh.read())
+            digest.update(b"\0")
+        return digest.hexdigest(), self._mtimes_now()
+
+    def check(self) -> bool:
+        """Rebuilds if the files' content changed; returns True when a new snapshot was swapped in."""
+        if self._mtimes_now() == self._mtimes:
+            return False
+        content_hash, mtimes = self._snapshot()
+        self._mtimes = mtimes
+        if content_hash == self._content_hash:
+            return False
+        try:
+            data = build_studio_data(read_secrets_files(self.paths), self.metrics_hook)
+        except Exception as e:
+            logger.error(f"Studio data reload failed, keeping previous version: {e}")
+            return False
+        if not (data.faqs or data.packages) and (self._data.faqs or self._data.packages):
+            # toml parses a truncated file leniently; an editor mid-save looks like "everything deleted"
+            logger.error("Studio data reload produced no FAQs or packages, keeping previous version.")
+            return False
+        self._content_hash = content_hash
+        self._data = data
+        logger.info(f"Studio data reloaded ({len(data.faqs)} FAQs, {len(data.packages)} packages).")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except OSError as e:
+                logger.warning(f"Studio data watcher could not read secrets: {e}")
+
+    def stop(self):
+        self._stop.set()
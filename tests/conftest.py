@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Tests import the app modules the same way the benchmarks do, from the repository root,
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# and reuse the offline stand-in for Gemini from benchmarks/
+sys.path.insert(1, str(Path(__file__).resolve().parents[1] / "benchmarks"))
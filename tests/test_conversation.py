@@ -0,0 +1,95 @@
+from conversation import ConversationMemory, first_sentence
+
+
+def fill(memory: ConversationMemory, n: int, size: int = 0) -> ConversationMemory:
+    for i in range(n):
+        memory.add(f"question {i}?" + " q" * size, f"answer {i}." + " a" * size)
+    return memory
+
+
+def test_turns_beyond_keep_turns_fold_into_the_summary():
+    memory = ConversationMemory(keep_turns=2)
+    assert not memory.add("question 0?", "answer 0.")
+    assert not memory.add("question 1?", "answer 1.")
+    assert not memory.stale
+    assert memory.add("question 2?", "answer 2.")
+    assert memory.stale
+    assert memory.window == 2
+    assert [t["user"] for t in memory.older()] == ["question 0?"]
+    assert [t["user"] for t in memory.recent()] == ["question 1?", "question 2?"]
+    assert memory.summary_lines == ["- Asked: question 0? → answer 0."]
+
+
+def test_window_shrinks_to_the_token_budget_but_keeps_the_last_turn():
+    # Each turn is about 45 tokens; two do not fit in 60
+    memory = fill(ConversationMemory(keep_turns=6, token_budget=60), 3, size=40)
+    assert memory.window == 1
+    assert len(memory.summary_lines) == 2
+
+    huge = ConversationMemory(token_budget=10)
+    huge.add("x" * 400, "y" * 400)
+    assert huge.window == 1 and not huge.stale
+
+
+def test_display_log_is_trimmed_to_max_log():
+    memory = fill(ConversationMemory(keep_turns=2, max_log=3), 5)
+    assert len(memory) == 3
+    assert memory.total_turns == 5
+    assert [t["user"] for t in memory.older()] == ["question 2?"]
+    assert memory.window == 2
+    assert ConversationMemory(keep_turns=4, max_log=1).max_log == 4
+
+
+def test_summary_is_capped_and_counts_dropped_topics():
+    # One folded line is about 8 tokens; two exceed the budget, so only the newest survives
+    memory = fill(ConversationMemory(keep_turns=1, summary_budget=10), 4)
+    assert memory.summary_lines == ["- Asked: question 2? → answer 2."]
+    assert memory.dropped_topics == 2
+    assert memory.summary == "(+2 earlier topics)\n- Asked: question 2? → answer 2."
+
+
+def test_repeated_questions_are_summarized_once():
+    memory = ConversationMemory(keep_turns=1)
+    for _ in range(3):
+        memory.add("price?", "8000 BDT.")
+    assert memory.summary_lines == ["- Asked: price? → 8000 BDT."]
+
+
+def test_summary_lines_keep_the_first_sentence_without_markup():
+    assert first_sentence("<b>Bridal</b> is 8000 BDT. Book early!", 100) == "Bridal is 8000 BDT."
+    assert first_sentence("a" * 20, 10) == "a" * 9 + "…"
+
+
+def test_seed_history_is_summary_exchange_then_verbatim_window():
+    assert ConversationMemory().seed_history() == []
+    memory = fill(ConversationMemory(keep_turns=1), 2)
+    history = memory.seed_history()
+    assert [content["role"] for content in history] == ["user", "model", "user", "model"]
+    assert history[0]["parts"][0] == "Summary of our earlier conversation:\n- Asked: question 0? → answer 0."
+    assert history[2:] == [{"role": "user", "parts": ["question 1?"]}, {"role": "model", "parts": ["answer 1."]}]
+    assert memory.context_tokens() > 0
+
+    unfolded = fill(ConversationMemory(), 1)
+    assert unfolded.seed_history() == [{"role": "user", "parts": ["question 0?"]}, {"role": "model", "parts": ["answer 0."]}]
+
+
+def test_to_dict_restore_round_trip():
+    memory = fill(ConversationMemory(keep_turns=2, summary_budget=10), 5)
+    restored = ConversationMemory(keep_turns=2, summary_budget=10)
+    restored.restore(memory.to_dict())
+    assert restored.to_dict() == memory.to_dict()
+    assert restored.seed_history() == memory.seed_history()
+    assert restored.summary == memory.summary
+    assert memory.stale and not restored.stale  # seeded on first use instead
+
+    smaller = ConversationMemory(keep_turns=1, max_log=1)
+    smaller.restore(memory.to_dict())
+    assert len(smaller) == 1 and smaller.window == 1
+    assert smaller.total_turns == 5
+
+
+def test_clear_forgets_everything():
+    memory = fill(ConversationMemory(keep_turns=1), 3)
+    memory.clear()
+    assert memory.to_dict() == ConversationMemory().to_dict()
+    assert not memory.stale
@@ -0,0 +1,73 @@
+import pytest
+
+from faq_batch import FAQBatchMatcher
+from faq_index import FAQIndex
+from query_cache import normalize_query
+
+FAQS = [
+    {"question": "How long does henna last?", "answer": "Usually 1-3 weeks."},
+    {"question": "Is your henna organic?", "answer": "Yes, no chemicals."},
+    {"question": "Bridal kto tk?", "answer": "8000 BDT."},
+    {"question": "Do you travel to Gazipur?", "answer": "Yes, with a travel charge."},
+    {"question": "Do you offer courses?", "answer": "Monthly batches."},
+]
+QUERIES = [
+    "how long does henna last",
+    "HOW LONG DOES HENNA LAST???",
+    "is the henna organic",
+    "bridal koto taka",
+    "do you travel to gazipur?",
+    "courses?",
+    "completely unrelated words",
+    "",
+]
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.65, 0.9])
+def test_batch_agrees_with_the_index_without_shortlisting(threshold):
+    index = FAQIndex(FAQS)
+    matcher = FAQBatchMatcher(FAQS, top_k=16)
+    assert len(FAQS) <= min(index.top_k, matcher.top_k)
+    for match in matcher.match_batch(QUERIES, threshold):
+        question, answer, score = index.best_match(normalize_query(match.query), threshold)
+        assert (match.question, match.answer) == (question, answer), match.query
+        if question is not None:
+            assert match.score == pytest.approx(score)
+
+
+def test_ties_go_to_the_earliest_faq():
+    faqs = [
+        {"question": "price list", "answer": "first"},
+        {"question": "other text", "answer": "x"},
+        {"question": "price list", "answer": "second"},
+        {"question": "Price List!", "answer": "third"},
+    ]
+    match = FAQBatchMatcher(faqs).match_batch(["price list"])[0]
+    assert (match.answer, match.score) == ("first", 1.0)
+    # The runner-up is the next-earliest of the tied entries
+    assert match.runner_up_score == 1.0
+    assert FAQIndex(faqs).best_match("price list", 0.65)[1] == "first"
+
+
+def test_first_faq_can_be_the_runner_up():
+    faqs = [{"question": "henna", "answer": "a"}, {"question": "henna price", "answer": "b"}]
+    match = FAQBatchMatcher(faqs).match_batch(["henna price"])[0]
+    assert (match.question, match.runner_up) == ("henna price", "henna")
+
+
+def test_empty_and_single_faq_lists():
+    empty = FAQBatchMatcher([]).match_batch(["anything"])[0]
+    assert (empty.question, empty.score, empty.runner_up, empty.runner_up_score) == (None, 0.0, None, 0.0)
+
+    single = FAQBatchMatcher(FAQS[:1])
+    hit, miss = single.match_batch(["how long does henna last", "unrelated"])
+    assert (hit.question, hit.runner_up, hit.runner_up_score) == (FAQS[0]["question"], None, 0.0)
+    assert miss.question is None and miss.score < 0.65
+
+
+def test_iter_matches_is_chunk_size_independent():
+    whole = FAQBatchMatcher(FAQS, chunk_size=512).match_batch(QUERIES)
+    for chunk_size in (1, 3, len(QUERIES)):
+        matcher = FAQBatchMatcher(FAQS, chunk_size=chunk_size)
+        assert list(matcher.iter_matches(iter(QUERIES))) == whole
+        assert matcher.match_batch(QUERIES) == whole
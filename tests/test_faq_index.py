@@ -0,0 +1,38 @@
+from faq_index import FAQHandler
+from query_cache import MISSING, AnswerCache
+
+FAQS = [
+    {"question": "kto tk?", "answer": "Packages start at 1500 BDT."},
+    {"question": "How long does henna last?", "answer": "Usually 1-3 weeks."},
+]
+
+
+def test_variants_sharing_a_cache_key_get_the_same_answer():
+    # Whichever variant arrives first must not decide the answer for the others
+    for order in (["kto tk?", "koto taka!!!!!!!!!!!"], ["koto taka!!!!!!!!!!!", "kto tk?"]):
+        handler = FAQHandler(FAQS)
+        results = [handler.find_similar_question(q) for q in order]
+        assert results[0] == results[1] == ("kto tk?", "Packages start at 1500 BDT.")
+
+
+def test_miss_is_cached_per_threshold():
+    handler = FAQHandler(FAQS)
+    assert handler.find_similar_question("completely unrelated") == (None, None)
+    assert handler.find_similar_question("How long does henna last", threshold=0.9)[0] == "How long does henna last?"
+    assert handler.find_similar_question("how long henna lasts", threshold=0.99) == (None, None)
+    assert handler.faq_cache.stats()["size"] == 3
+
+
+def test_answer_cache_is_bounded_and_expires():
+    now = [0.0]
+    cache = AnswerCache(maxsize=2, ttl=60, timer=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", (None, None))  # misses are values too; evicts "b", the least recently used
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == (None, None)
+    now[0] = 61
+    assert cache.get("a") is MISSING
+    stats = cache.stats()
+    assert (stats["evictions"], stats["expirations"] >= 1, stats["hits"], stats["misses"]) == (1, True, 2, 2)
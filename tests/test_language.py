@@ -0,0 +1,29 @@
+import pytest
+
+from bench_language import LABELED
+from language import detect_language
+
+# Below this share of the labeled set the router is worse than the heuristics it replaced
+MIN_ACCURACY = 0.95
+
+
+def test_labeled_set_accuracy():
+    misses = [(q, label, detect_language(q)) for q, label in LABELED if detect_language(q) != label]
+    assert 1 - len(misses) / len(LABELED) >= MIN_ACCURACY, misses
+
+
+@pytest.mark.parametrize("query, label", [
+    ("bridal mehndi", "en"),
+    ("Arabic design", "en"),
+    ("kto tk?", "banglish"),
+    ("koto taka", "banglish"),
+    ("দাম কত", "bn"),
+    ("", "en"),
+    ("!!!", "en"),
+])
+def test_short_queries(query, label):
+    assert detect_language(query) == label
+
+
+def test_detection_ignores_case_and_punctuation():
+    assert detect_language("APU KOTO TAKA???") == detect_language("apu koto taka") == "banglish"
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+import markup
+from synthetic import make_secrets
+
+HOME = str(Path(__file__).resolve().parents[1] / "Home.py")
+
+
+def run_app(secrets) -> AppTest:
+    at = AppTest.from_file(HOME, default_timeout=60)
+    for section, values in secrets.items():
+        at.secrets[section] = values
+    return at
+
+
+def test_markup_caches_are_reused_across_reruns():
+    secrets = make_secrets(20, 30)
+    secrets.update({"cache": {"response_path": ""}, "sessions": {"backend": "memory"}})
+    markup.card_markup.cache_clear()
+    markup.faq_answer_markup.cache_clear()
+
+    at = run_app(secrets)
+    at.run()
+    assert not at.exception
+    first = markup.card_markup.cache_info()
+    first_faq = markup.faq_answer_markup.cache_info()
+    assert first.misses and not first.hits
+    assert first_faq.misses
+
+    at.run()
+    assert not at.exception
+    second = markup.card_markup.cache_info()
+    second_faq = markup.faq_answer_markup.cache_info()
+    # The rerun draws the same cards and FAQ answers and builds none of them again
+    assert second.misses == first.misses
+    assert second.hits >= first.misses
+    assert second_faq.misses == first_faq.misses
+    assert second_faq.hits >= first_faq.misses
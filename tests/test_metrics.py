@@ -0,0 +1,19 @@
+from metrics import Metrics
+
+
+def test_jsonl_snapshots_rotate_at_the_size_bound(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    metrics = Metrics()
+    metrics.write_jsonl(str(path), max_bytes=1)
+    metrics.write_jsonl(str(path), max_bytes=1)
+    metrics.write_jsonl(str(path), max_bytes=1)
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+    assert len((tmp_path / "metrics.jsonl.1").read_text(encoding="utf-8").splitlines()) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["metrics.jsonl", "metrics.jsonl.1"]
+
+
+def test_jsonl_snapshots_append_without_a_bound(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    for _ in range(3):
+        Metrics().write_jsonl(str(path))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
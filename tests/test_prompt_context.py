@@ -0,0 +1,23 @@
+from prompt_context import PromptContextBuilder
+from studio_data import build_studio_data
+from synthetic import make_secrets
+
+FAQS = [
+    {"question": "Bridal kto tk?", "answer": "8000 BDT."},
+    {"question": "Rong koto din thake? Taka ferot hoy?", "answer": "1-3 weeks; no refunds after application."},
+    {"question": "Do you travel to Gazipur?", "answer": "Yes, with a travel charge."},
+]
+PERSONAL = {"name": "Rafiya", "packages": [{"name": "Royal Bridal", "type": "Bridal", "price": 8000}]}
+
+
+def test_banglish_variants_retrieve_the_same_snippets():
+    # Spelled out, the price question must still find the FAQ written in short form, like the FAQ tier does
+    builder = PromptContextBuilder(FAQS, PERSONAL, top_k=1)
+    assert builder.snippets("koto taka?")[:1] == builder.snippets("kto tk?")[:1] == ["Q: Bridal kto tk? A: 8000 BDT."]
+
+
+def test_snapshot_shares_the_local_tier_faq_index():
+    studio = build_studio_data(make_secrets(20, 10))
+    assert studio.prompt_context.faq_index is studio.retriever.index
+    faq = studio.faqs[3]
+    assert studio.prompt_context.snippets(faq.question)[0] == f"Q: {faq.question} A: {faq.answer}"
@@ -0,0 +1,65 @@
+from conversation import ConversationMemory
+from gemini_pool import ChatSessionPool
+from Home import AgenticAI
+from response_cache import ResponseCache
+from stub_llm import StubModel
+
+CONTEXT = {
+    "faq": [{"question": "How long does henna last?", "answer": "Usually 1-3 weeks."}],
+    "personal": {"name": "Rafiya", "packages": [{"name": "Royal Bridal", "price": 8000}]},
+}
+
+
+def test_paraphrase_hits_but_negation_and_language_must_agree():
+    cache = ResponseCache()
+    cache.store("How much for bridal henna on both hands?", "en", "8000 BDT")
+    assert cache.lookup("how much for bridal henna on both hands", "en") == "8000 BDT"
+    assert cache.lookup("How much for bridal henna on both hands please?", "en") == "8000 BDT"
+    assert cache.lookup("How much for non bridal henna on both hands?", "en") is None
+    assert cache.lookup("How much for bridal henna on both hands?", "bn") is None
+
+
+def test_numbers_must_agree():
+    cache = ResponseCache()
+    cache.store("price for 2 hands bridal design", "en", "two hands")
+    assert cache.lookup("price for 3 hands bridal design", "en") is None
+
+
+def test_content_change_drops_entries_in_memory_and_on_disk(tmp_path):
+    path = str(tmp_path / "responses.json")
+    cache = ResponseCache(path)
+    cache.ensure_version("v1")
+    cache.store("bridal price?", "en", "8000 BDT")
+    cache.save()
+    assert ResponseCache(path).lookup("bridal price?", "en") == "8000 BDT"
+
+    reloaded = ResponseCache(path)
+    assert not reloaded.ensure_version("v1")
+    assert reloaded.ensure_version("v2")
+    assert reloaded.lookup("bridal price?", "en") is None
+    assert ResponseCache(path).lookup("bridal price?", "en") is None
+    assert reloaded.stats()["invalidations"] == 1
+
+
+def test_only_opening_messages_are_cached_and_served():
+    model = StubModel(words=12, first_token_delay=0, chunk_delay=0)
+    cache = ResponseCache()
+
+    def ask(session_id: str, memory: ConversationMemory, question: str) -> str:
+        ai = AgenticAI("offline", CONTEXT, response_cache=cache, pool=ChatSessionPool(lambda: model),
+                       session_id=session_id, memory=memory)
+        reply = "".join(ai.stream_response(question))
+        memory.add(question, reply)
+        return reply
+
+    alice, bob = ConversationMemory(), ConversationMemory()
+    opening = ask("alice", alice, "do you travel to gazipur?")
+    ask("alice", alice, "what about savar?")
+    assert model.calls == 2
+    assert cache.stats()["size"] == 1
+
+    # Another visitor's opening message may reuse the cached opener, but not a follow-up
+    assert ask("bob", bob, "do you travel to gazipur?") == opening.strip()
+    assert model.calls == 2
+    ask("bob", bob, "what about savar?")
+    assert model.calls == 3
@@ -0,0 +1,57 @@
+import pytest
+
+from retrieval import LocalRetriever
+
+FAQS = [
+    {"question": "How much does an organic henna cone cost?", "answer": "Organic cones are 150 BDT each."},
+    {"question": "Is bridal henna safe for sensitive skin?", "answer": "Yes, we only use natural henna."},
+    {"question": "Do you offer home service?", "answer": "Yes, within Dhaka city."},
+]
+PACKAGES = [
+    {"name": "Royal Bridal", "type": "Bridal", "length": "Elbow", "hand": "Both Hands", "side": "Front & Back", "price": 8000},
+    {"name": "Minimal Party", "type": "Non-Bridal", "length": "Wrist", "hand": "One Hand", "side": "Front", "price": 1500},
+]
+PROFILE = {"name": "Rafiya", "phone": "01323278403", "address": "Mirpur, Dhaka", "email": "studio@example.com"}
+
+# (query, expected answer kind or None for "escalate to the LLM")
+ROUTING = [
+    ("bridal price", "price"),
+    ("non-bridal price koto", "price"),
+    ("how much is Royal Bridal?", "price"),
+    ("price for elbow both hands bridal", "price"),
+    ("দাম কত bridal", "price"),
+    ("what is your phone number", "profile"),
+    ("contact number please", "profile"),
+    ("where are you located?", "profile"),
+    ("email?", "profile"),
+    ("how much does organic henna cone cost", "faq"),
+    ("How much does an organic henna cone cost? price", "faq"),
+    ("what is the number of hands covered in Royal Bridal?", None),
+    ("where can I buy cones?", None),
+    ("Is bridal henna safe in pregnancy? price?", None),
+    ("how much time does bridal henna take", None),
+    ("bridal travel charge", None),
+    ("kids package price", None),
+    ("what are your prices", None),
+    ("hello there", None),
+]
+
+
+@pytest.fixture(scope="module")
+def retriever():
+    return LocalRetriever(FAQS, PACKAGES, PROFILE)
+
+
+@pytest.mark.parametrize("query, kind", ROUTING)
+def test_routing(retriever, query, kind):
+    answer = retriever.answer(query)
+    assert (answer.kind if answer else None) == kind
+
+
+def test_price_prefers_the_most_specific_facet_value(retriever):
+    answer = retriever.answer("non bridal price")
+    assert "Minimal Party" in answer.text and "Royal Bridal" not in answer.text
+
+
+def test_answers_are_memoized_per_normalized_query(retriever):
+    assert retriever.answer("Bridal price?") is retriever.answer("bridal   PRICE")
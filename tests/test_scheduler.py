@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from scheduler import DeadlineExceeded, RequestScheduler
+
+
+class APIError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def make_scheduler(**kwargs) -> RequestScheduler:
+    options = dict(max_in_flight=2, requests_per_minute=6000, burst=100, deadline=5, sleep=lambda seconds: None)
+    options.update(kwargs)
+    return RequestScheduler(**options)
+
+
+def failing_call(failures: int, code: int = 429):
+    attempts = []
+
+    def call(timeout):
+        attempts.append(timeout)
+        if len(attempts) <= failures:
+            raise APIError(code)
+        return iter(["hello ", "world"])
+
+    return call, attempts
+
+
+def test_quota_errors_are_retried_with_backoff():
+    sleeps = []
+    scheduler = make_scheduler(sleep=sleeps.append)
+    call, attempts = failing_call(2)
+    assert "".join(scheduler.stream("k", call)) == "hello world"
+    assert len(attempts) == 3
+    assert len(sleeps) == scheduler.counters["retries"] == 2
+
+
+def test_retries_stop_after_max_attempts():
+    scheduler = make_scheduler(max_attempts=3)
+    call, attempts = failing_call(5)
+    with pytest.raises(APIError):
+        list(scheduler.stream("k", call))
+    assert len(attempts) == 3
+    assert scheduler.counters["errors"] == 1
+
+
+def test_client_errors_are_not_retried():
+    scheduler = make_scheduler()
+    call, attempts = failing_call(1, code=400)
+    with pytest.raises(APIError):
+        list(scheduler.stream("k", call))
+    assert len(attempts) == 1
+    assert scheduler.counters["retries"] == 0
+
+
+def test_request_waiting_for_a_slot_past_its_deadline_fails():
+    scheduler = make_scheduler(max_in_flight=1)
+    holder = scheduler.stream("first", lambda timeout: iter(["a", "b"]))
+    assert next(holder) == "a"  # the slot stays taken until the stream is consumed
+    with pytest.raises(DeadlineExceeded):
+        list(scheduler.stream("second", lambda timeout: iter(["c"]), deadline=0.05))
+    assert scheduler.counters["deadline_exceeded"] == 1
+    assert list(holder) == ["b"]
+    assert list(scheduler.stream("third", lambda timeout: iter(["d"]))) == ["d"]
+
+
+def test_in_flight_cap_holds_under_concurrency():
+    scheduler = make_scheduler(max_in_flight=2)
+    lock, active, peak = threading.Lock(), [0], [0]
+
+    def call(timeout):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            time.sleep(0.02)
+            yield "done"
+        finally:
+            with lock:
+                active[0] -= 1
+
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(list(scheduler.stream(f"k{i}", call))))
+               for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [["done"]] * 8
+    assert peak[0] == 2
+
+
+def test_only_identical_keys_share_an_in_flight_call():
+    scheduler = make_scheduler()
+    release, calls = threading.Event(), []
+
+    def call(timeout):
+        calls.append(timeout)
+        release.wait(2)
+        yield "shared"
+
+    results = {}
+
+    def ask(name, key):
+        results[name] = list(scheduler.stream(key, call))
+
+    threads = [threading.Thread(target=ask, args=(name, key))
+               for name, key in (("leader", "s1:0:hi"), ("duplicate", "s1:0:hi"), ("other", "s2:0:hi"))]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 2
+    while (len(calls) < 2 or scheduler.counters["coalesced"] < 1) and time.monotonic() < deadline:
+        time.sleep(0.005)
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == {"leader": ["shared"], "duplicate": ["shared"], "other": ["shared"]}
+    assert len(calls) == 2
+    assert scheduler.stats() == dict(scheduler.counters, in_flight=0)
+    assert scheduler.counters["coalesced"] == 1
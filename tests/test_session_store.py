@@ -0,0 +1,176 @@
+import time
+
+import pytest
+
+from conversation import ConversationMemory
+from session_store import MemoryBackend, SessionData, SessionStore, SQLiteBackend, resolve_session_id
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def new_session() -> SessionData:
+    return SessionData(set(), ConversationMemory())
+
+
+def make_store(backend=None, clock=None, **kwargs) -> SessionStore:
+    options = dict(flush_interval=0, idle_ttl=60, timer=clock or Clock())
+    options.update(kwargs)
+    return SessionStore(backend if backend is not None else MemoryBackend(), new_session, **options)
+
+
+def test_changes_are_written_behind_and_survive_a_new_store():
+    backend = MemoryBackend()
+    store = make_store(backend)
+    session = store.get("a")
+    session.favorites.add("Royal Bridal")
+    session.conversation.add("bridal price?", "8000 BDT")
+    store.mark_dirty("a", session)
+    assert len(backend) == 0  # nothing is written until the batch flush
+
+    assert store.flush() == 1
+    assert store.flush() == 0
+    restored = make_store(backend).get("a")
+    assert restored.favorites == {"Royal Bridal"}
+    assert restored.conversation.total_turns == 1
+    assert store.stats()["writes"] == 1
+
+
+def test_idle_sessions_are_flushed_then_dropped():
+    backend, clock = MemoryBackend(), Clock()
+    store = make_store(backend, clock)
+    session = store.get("a")
+    session.favorites.add("Mini Mehndi")
+    store.mark_dirty("a", session)
+    store.get("b")
+
+    clock.now = 30
+    store.get("b")  # still in use
+    clock.now = 61
+    assert store.evict_idle() == 1
+    assert store.stats()["cached"] == 1
+    assert backend.load("a")["favorites"] == ["Mini Mehndi"]
+    assert store.get("a") is not session
+    assert store.get("a").favorites == {"Mini Mehndi"}
+
+
+def test_least_recently_used_sessions_are_evicted_beyond_max_cached():
+    backend = MemoryBackend()
+    store = make_store(backend, max_cached=2)
+    first = store.get("a")
+    first.favorites.add("Royal Bridal")
+    store.mark_dirty("a", first)
+    store.get("b")
+    store.get("c")
+    stats = store.stats()
+    assert (stats["cached"], stats["evictions"]) == (2, 1)
+    assert backend.load("a")["favorites"] == ["Royal Bridal"]
+
+
+def test_session_evicted_while_held_is_recached_by_mark_dirty():
+    backend, clock = MemoryBackend(), Clock()
+    store = make_store(backend, clock)
+    held = store.get("a")
+    clock.now = 100
+    store.evict_idle()
+    assert store.stats()["cached"] == 0
+
+    # The script still holds the object and writes to it after the eviction
+    held.favorites.add("Arabic Flow")
+    store.mark_dirty("a", held)
+    assert store.get("a") is held
+    store.flush()
+    assert backend.load("a")["favorites"] == ["Arabic Flow"]
+
+
+def test_refresh_rereads_the_backend_but_keeps_pending_local_changes():
+    backend = MemoryBackend()
+    here, elsewhere = make_store(backend), make_store(backend)
+
+    remote = elsewhere.get("a")
+    remote.favorites.add("Written elsewhere")
+    elsewhere.mark_dirty("a", remote)
+    elsewhere.flush()
+    local = here.get("a")
+    assert local.favorites == {"Written elsewhere"}
+
+    remote.favorites.add("Second write")
+    elsewhere.mark_dirty("a", remote)
+    elsewhere.flush()
+    assert here.get("a").favorites == {"Written elsewhere"}
+    assert here.get("a", refresh=True).favorites == {"Written elsewhere", "Second write"}
+
+    pending = here.get("a")
+    pending.favorites = {"Local only"}
+    here.mark_dirty("a", pending)
+    assert here.get("a", refresh=True) is pending
+
+
+def test_failed_flush_is_retried_next_cycle():
+    class FlakyBackend(MemoryBackend):
+        fail = True
+
+        def save_many(self, states):
+            if self.fail:
+                raise OSError("disk full")
+            super().save_many(states)
+
+    backend = FlakyBackend()
+    store = make_store(backend)
+    session = store.get("a")
+    store.mark_dirty("a", session)
+    assert store.flush() == 0
+    assert store.stats()["dirty"] == 1
+    backend.fail = False
+    assert store.flush() == 1
+    assert store.stats()["dirty"] == 0
+
+
+def test_background_thread_flushes_on_its_interval():
+    backend = MemoryBackend()
+    store = make_store(backend, timer=time.monotonic, flush_interval=0.01)
+    store.mark_dirty("a", store.get("a"))
+    deadline = time.monotonic() + 2
+    while backend.load("a") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.stop()
+    assert backend.load("a") is not None
+
+
+def test_sqlite_backend_upserts_and_purges(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "sessions.db"))
+    backend.save_many({"a": {"favorites": ["one"]}, "b": {"favorites": []}})
+    backend.save_many({"a": {"favorites": ["two"]}})
+    assert len(backend) == 2
+    assert backend.load("a") == {"favorites": ["two"]}
+    assert backend.load("missing") is None
+
+    backend.delete("b")
+    assert len(backend) == 1
+    assert backend.purge(time.time() + 1) == 1
+    assert len(backend) == 0
+
+
+def test_store_purges_sqlite_rows_past_retention(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "sessions.db"))
+    backend.save_many({"a": {"favorites": ["old"]}})
+    backend._conn.execute("UPDATE sessions SET updated = ?", (time.time() - 100 * 86400,))
+    make_store(backend, retention_days=90)
+    assert len(backend) == 0
+
+
+@pytest.mark.parametrize("candidate, kept", [
+    ("0123456789abcdef0123456789abcdef", True),
+    ("0123456789ABCDEF0123456789ABCDEF", False),
+    ("../../etc/passwd", False),
+    (None, False),
+])
+def test_resolve_session_id(candidate, kept):
+    resolved = resolve_session_id(candidate)
+    assert (resolved == candidate) is kept
+    assert len(resolved) == 32
@@ -0,0 +1,51 @@
+from gemini_pool import ChatSessionPool
+from Home import AgenticAI
+from scheduler import RequestScheduler
+from stub_llm import StubModel
+
+CONTEXT = {
+    "faq": [{"question": "How long does henna last?", "answer": "Usually 1-3 weeks."}],
+    "personal": {"name": "Rafiya", "packages": [{"name": "Royal Bridal", "price": 8000}]},
+}
+QUESTION = "do you travel to gazipur?"
+FALLBACK = "🤖 Couldn’t process statement. Drop a direct note instead!"
+
+
+def make_ai(model: StubModel, **kwargs) -> AgenticAI:
+    return AgenticAI("offline", CONTEXT, pool=ChatSessionPool(lambda: model), **kwargs)
+
+
+def stub(**kwargs) -> StubModel:
+    return StubModel(words=12, chunk_words=4, first_token_delay=0, chunk_delay=0, **kwargs)
+
+
+def test_reply_arrives_in_chunks():
+    model = stub()
+    chunks = list(make_ai(model).stream_response(QUESTION))
+    assert len(chunks) == 3 and all(chunks)
+    assert model.calls == 1
+
+
+def test_empty_reply_is_retried_on_a_fresh_chat():
+    model = stub(empty_replies=1)
+    ai = make_ai(model)
+    first_chat = ai.chat_session
+    reply = "".join(ai.stream_response(QUESTION))
+    assert model.calls == 2
+    assert reply.strip() and reply != FALLBACK
+    assert ai.chat_session is not first_chat
+
+
+def test_two_empty_replies_fall_back_to_a_note():
+    model = stub(empty_replies=2)
+    assert list(make_ai(model).stream_response(QUESTION)) == [FALLBACK]
+    assert model.calls == 2
+
+
+def test_quota_error_before_the_first_token_is_retried_through_the_scheduler():
+    model = stub(fail_first=1)
+    scheduler = RequestScheduler(requests_per_minute=6000, sleep=lambda seconds: None)
+    reply = "".join(make_ai(model, scheduler=scheduler).stream_response(QUESTION))
+    assert model.calls == 2
+    assert scheduler.counters["retries"] == 1
+    assert reply.strip() and not reply.startswith(("⏳", "⚠️"))
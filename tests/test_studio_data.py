@@ -0,0 +1,105 @@
+import os
+
+import pytest
+import toml
+
+from studio_data import StudioDataStore, build_studio_data, parse_faqs, parse_packages
+
+PACKAGE = {"name": "Royal Bridal", "type": "Bridal", "length": "Elbow", "hand": "Both Hands", "side": "Front & Back", "price": 8000}
+SECRETS = {
+    "genai": {"api_key": "offline"},
+    "faq": {"questions": [{"question": "How long does henna last?", "answer": "Usually 1-3 weeks."}]},
+    "personal": {"data": {"name": "Rafiya", "packages": [PACKAGE]}},
+}
+
+
+def test_package_rows_are_validated_and_bad_rows_skipped():
+    issues = []
+    packages = parse_packages([
+        dict(PACKAGE, price="1,500 BDT"),
+        dict(PACKAGE, name="Half Hand", price=" 2500.5 "),
+        {k: v for k, v in PACKAGE.items() if k != "side"},
+        dict(PACKAGE, name="Free Trial", price="free"),
+        dict(PACKAGE, name="Flag", price=True),
+        dict(PACKAGE, name="   "),
+        "not a table",
+    ], issues)
+    assert [(p.name, p.price) for p in packages] == [("Royal Bridal", 1500), ("Half Hand", 2500.5)]
+    assert issues == [
+        "package #2 (Royal Bridal): invalid side, skipped",
+        "package #3 (Free Trial): invalid price, skipped",
+        "package #4 (Flag): invalid price, skipped",
+        "package #5 (?): invalid name, skipped",
+        "package #6: not a table, skipped",
+    ]
+
+
+def test_faq_rows_are_validated_and_bad_rows_skipped():
+    issues = []
+    faqs = parse_faqs([
+        {"question": " Organic? ", "answer": "Yes."},
+        {"question": "No answer"},
+        {"question": "Course?", "answer": "Monthly.", "category": "training"},
+        42,
+    ], issues)
+    assert [(f.question, f.category) for f in faqs] == [("Organic?", "general"), ("Course?", "training")]
+    assert issues == ["faq #1: missing question or answer, skipped", "faq #3: not a table, skipped"]
+
+
+def test_fingerprint_follows_content():
+    first, again = build_studio_data(SECRETS), build_studio_data(SECRETS)
+    assert first.fingerprint == again.fingerprint
+    changed = dict(SECRETS, personal={"data": {"name": "Rafiya", "packages": [dict(PACKAGE, price=9000)]}})
+    assert build_studio_data(changed).fingerprint != first.fingerprint
+
+
+@pytest.fixture
+def studio_file(tmp_path):
+    path = tmp_path / "secrets.toml"
+    path.write_text(toml.dumps(SECRETS), encoding="utf-8")
+    store = StudioDataStore([str(path)], poll_interval=3600)
+    yield path, store
+    store.stop()
+
+
+def write(path, text: str, bump: int):
+    path.write_text(text, encoding="utf-8")
+    # Coarse filesystem clocks can leave the mtime unchanged within one test
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + bump))
+
+
+def test_reload_only_when_content_changes(studio_file):
+    path, store = studio_file
+    original = store.data
+    assert not store.check()
+
+    write(path, path.read_text(encoding="utf-8"), bump=1)
+    assert not store.check()
+    assert store.data is original
+
+    updated = dict(SECRETS, personal={"data": {"name": "Rafiya", "packages": [dict(PACKAGE, price=9000)]}})
+    write(path, toml.dumps(updated), bump=2)
+    assert store.check()
+    assert store.data.packages[0].price == 9000
+    assert store.data.fingerprint != original.fingerprint
+
+
+def test_unparseable_file_keeps_the_previous_snapshot(studio_file):
+    path, store = studio_file
+    original = store.data
+    write(path, "[faq\nquestions = ", bump=1)
+    assert not store.check()
+    assert store.data is original
+
+    write(path, toml.dumps(dict(SECRETS, genai={"api_key": "rotated"})), bump=2)
+    assert store.check()
+    assert store.data.api_key == "rotated"
+
+
+def test_emptied_file_keeps_the_previous_snapshot(studio_file):
+    path, store = studio_file
+    original = store.data
+    write(path, "", bump=1)
+    assert not store.check()
+    assert store.data is original